@@ -1,8 +1,10 @@
 """
 Pydantic models for request/response validation
 """
-from pydantic import BaseModel, Field
-from typing import Optional, List, Dict, Any
+from bisect import insort
+
+from pydantic import BaseModel, Field, PrivateAttr
+from typing import Optional, List, Dict, Any, Tuple
 from enum import Enum
 
 
@@ -458,6 +460,10 @@ class WorkflowTrace(BaseModel):
     statistics: Dict[str, Any] = Field(default_factory=dict, description="Trace statistics")
 
 
+def _node_timestamp(node: WorkflowNode) -> float:
+    return node.timestamp
+
+
 class WorkflowGraph(BaseModel):
     """Complete workflow graph for a scan"""
     scan_id: str = Field(..., description="Scan identifier")
@@ -467,6 +473,84 @@ class WorkflowGraph(BaseModel):
     statistics: Dict[str, Any] = Field(default_factory=dict, description="Overall statistics")
     layout_hints: Dict[str, Any] = Field(default_factory=dict, description="Hints for frontend graph layout")
 
+    # (node_type, name) → first node with that key; covers nodes[:_indexed]
+    _node_index: Dict[Tuple[WorkflowNodeType, str], WorkflowNode] = PrivateAttr(default_factory=dict)
+    _indexed: int = PrivateAttr(default=0)
+    # nodes grouped by type; None once a node is added (rebuilt on next read)
+    _by_type: Optional[Dict[WorkflowNodeType, List[WorkflowNode]]] = PrivateAttr(default=None)
+    _by_type_count: int = PrivateAttr(default=0)
+    # nodes ordered by timestamp (ties in insertion order), kept by add_node
+    _by_time: List[WorkflowNode] = PrivateAttr(default_factory=list)
+    # bumped on every change made through add_node/add_edge/touch
+    _version: int = PrivateAttr(default=0)
+
+    @property
+    def version(self) -> int:
+        """Change counter for caches derived from the graph."""
+        return self._version
+
+    def touch(self) -> None:
+        """Record an in-place change (e.g. to a node's metadata)."""
+        self._version += 1
+
+    def add_node(self, node: WorkflowNode) -> None:
+        """Append a node to the graph."""
+        self.nodes.append(node)
+        self._version += 1
+        self._by_type = None
+        if len(self._by_time) == len(self.nodes) - 1:
+            insort(self._by_time, node, key=_node_timestamp)
+
+    @property
+    def nodes_by_time(self) -> List[WorkflowNode]:
+        """Nodes in timestamp order; equal timestamps keep insertion order.
+
+        Maintained incrementally by add_node, so reading it does not sort.
+        Rebuilt if nodes were changed some other way; callers must not
+        mutate the returned list.
+        """
+        if len(self._by_time) != len(self.nodes):
+            self._by_time = sorted(self.nodes, key=_node_timestamp)
+        return self._by_time
+
+    @property
+    def nodes_by_type(self) -> Dict[WorkflowNodeType, List[WorkflowNode]]:
+        """Nodes grouped by type, in graph order (every type has a list).
+
+        Memoized until the next add_node (or any other change in the node
+        count); callers must not mutate the returned lists.
+        """
+        nodes = self.nodes
+        if self._by_type is None or self._by_type_count != len(nodes):
+            by_type: Dict[WorkflowNodeType, List[WorkflowNode]] = {t: [] for t in WorkflowNodeType}
+            for node in nodes:
+                by_type[node.node_type].append(node)
+            self._by_type = by_type
+            self._by_type_count = len(nodes)
+        return self._by_type
+
+    def add_edge(self, edge: WorkflowEdge) -> None:
+        """Append an edge to the graph."""
+        self.edges.append(edge)
+        self._version += 1
+
+    def find(self, node_type: WorkflowNodeType, name: str) -> Optional[WorkflowNode]:
+        """Return the first node with the given type and name, or None.
+
+        Nodes are indexed lazily as they are appended, so a lookup costs
+        O(1) plus the nodes added since the previous lookup.  ``nodes`` is
+        treated as append-only; if it shrinks the index is rebuilt.
+        """
+        nodes = self.nodes
+        index = self._node_index
+        if len(nodes) < self._indexed:
+            index.clear()
+            self._indexed = 0
+        for node in nodes[self._indexed:]:
+            index.setdefault((node.node_type, node.name), node)
+        self._indexed = len(nodes)
+        return index.get((node_type, name))
+
     class Config:
         json_schema_extra = {
             "example": {
@@ -4,25 +4,168 @@ Communicates with the garak container over HTTP/SSE instead of
 spawning local subprocesses.
 """
 import asyncio
+import gc
+import hashlib
+import heapq
 import json
 import logging
+import os
+import threading
 import time
 import uuid
-from datetime import datetime
+from collections import Counter, OrderedDict
+from contextlib import contextmanager
+from datetime import date, datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from types import MappingProxyType
+from typing import Callable, Dict, List, Mapping, Optional, Any, Tuple, Union
 
 import httpx
+import orjson
 
 from models.schemas import ScanStatus, ScanConfigRequest
 from services.workflow_analyzer import workflow_analyzer
 from config import settings
 
+try:
+    import xxhash
+except ImportError:  # in requirements.txt; BLAKE2b fallback keeps bare installs working
+    xxhash = None
+
 logger = logging.getLogger(__name__)
 
 # Default TTL for report cache (seconds)
 REPORT_CACHE_TTL = 300  # 5 minutes
 
+# How long a scan_id with no report anywhere is remembered as missing (seconds)
+NEGATIVE_CACHE_TTL = 5
+# Max number of missing scan_ids remembered (least recently missed evicted first)
+NEGATIVE_CACHE_MAX = 1024
+
+# Local JSONL reports are named garak.<scan_id>.report.jsonl
+REPORT_PREFIX = "garak."
+REPORT_SUFFIX = ".report.jsonl"
+REPORT_NAME_MIN_LEN = len(REPORT_PREFIX) + len(REPORT_SUFFIX)
+
+
+# Pause state shared by concurrent parses: gc.disable() is process-wide, so
+# the collector is only resumed when the last overlapping parse finishes.
+_gc_pause_lock = threading.Lock()
+_gc_pause_depth = 0
+_gc_resume_after_pause = False
+
+
+@contextmanager
+def _gc_paused():
+    """Suspend the cyclic garbage collector for a bulk allocation burst.
+
+    Parsing a large report creates one dict per JSONL row.  Every 700
+    container allocations trigger a gen-0 collection that traverses all
+    of the freshly parsed (and still live) entries, so a 100k-row report
+    spends most of its parse time in the collector.  None of those
+    objects are garbage, so the collector is paused until the burst ends.
+
+    Overlapping pauses (other threads, nested calls) share one pause: the
+    first one in disables the collector and the last one out re-enables
+    it, and only if it was enabled when the first one came in.
+    """
+    global _gc_pause_depth, _gc_resume_after_pause
+    with _gc_pause_lock:
+        if _gc_pause_depth == 0:
+            _gc_resume_after_pause = gc.isenabled()
+            gc.disable()
+        _gc_pause_depth += 1
+    try:
+        yield
+    finally:
+        with _gc_pause_lock:
+            _gc_pause_depth -= 1
+            if _gc_pause_depth == 0 and _gc_resume_after_pause:
+                gc.enable()
+
+
+def _safe_loads(line: bytes, loads=orjson.loads) -> Optional[dict]:
+    """Decode one JSONL row, returning None for malformed input.
+
+    orjson is strict RFC 8259, so rows it rejects get a second chance with
+    the stdlib decoder, which also accepts the NaN/Infinity tokens Python's
+    ``json.dumps`` emits.
+    """
+    try:
+        return loads(line)
+    except ValueError:
+        pass
+    try:
+        return json.loads(line)
+    except ValueError:
+        return None
+
+
+def _parse_jsonl(data: bytes) -> List[dict]:
+    """Parse raw JSONL bytes into a list of entries, skipping bad lines.
+
+    Shared by every report source (object store, local file, garak
+    service).  Works on the undecoded bytes and drives the decode through
+    ``map``/``filter`` so the per-line iteration runs in C rather than
+    as interpreted loop bytecode.
+
+    Rows that decode to anything other than a JSON object are treated as
+    malformed, since every consumer indexes entries by key.
+    """
+    with _gc_paused():
+        return [
+            e for e in map(_safe_loads, filter(None, data.split(b"\n")))
+            if isinstance(e, dict)
+        ]
+
+
+# Cached report rows: shared read-only views, so a consumer that tries to
+# mutate a row raises instead of silently corrupting every later reader.
+ReportEntries = Tuple[Mapping[str, Any], ...]
+
+
+def _freeze_entries(entries: List[dict]) -> ReportEntries:
+    """Wrap parsed rows as a tuple of read-only mapping proxies (no copy).
+
+    One tracked proxy per row is another allocation burst over rows that
+    are all live, so the collector stays paused here too.
+    """
+    with _gc_paused():
+        return tuple(map(MappingProxyType, entries))
+
+
+def _content_digest(data: bytes) -> bytes:
+    """Fingerprint a report's raw bytes to detect identical-content rewrites.
+
+    Uses xxh3 (``xxhash`` from requirements.txt), which runs at memory
+    bandwidth; falls back to the much slower BLAKE2b if it is missing.
+    """
+    if xxhash is not None:
+        return xxhash.xxh3_128_digest(data)
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+@lru_cache(maxsize=4096)
+def _started_day(day_key: str) -> Optional[int]:
+    """Map a ``YYYY-MM-DD`` day key to its ordinal day, or None if invalid.
+
+    Callers pass the first ten characters of an ISO start timestamp; only
+    the calendar day matters for trend bucketing, so the time part is
+    never parsed.  Memoized because the same days recur on every
+    statistics call.
+    """
+    try:
+        return date.fromisoformat(day_key).toordinal()
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=4096)
+def _probe_category(probe_classname: str) -> str:
+    """Return the module part of a probe classname ("dan.Dan_11_0" → "dan")."""
+    return probe_classname.partition(".")[0]
+
 
 def _db_available() -> bool:
     """Check if the database has been initialized."""
@@ -48,19 +191,54 @@ class MaxConcurrentScansError(Exception):
 class GarakWrapper:
     """HTTP client for the garak container service."""
 
-    def __init__(self, garak_service_url: Optional[str] = None, cache_ttl: int = REPORT_CACHE_TTL):
-        self.garak_service_url = garak_service_url or settings.garak_service_url
+    def __init__(
+        self,
+        garak_service_url: Optional[str] = None,
+        cache_ttl: int = REPORT_CACHE_TTL,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+        settings: Optional[Any] = None,
+    ):
+        # Explicit settings object (e.g. a SimpleNamespace in tests); None
+        # means the module-level config, looked up at each use
+        self._settings = settings
+        config = self._config
+        self.garak_service_url = garak_service_url or config.garak_service_url
         self.active_scans: Dict[str, Dict[str, Any]] = {}
-        self.garak_reports_dir = settings.garak_reports_path
-        # Layer 1: raw JSONL entries  scan_id → {"entries": [...], "mtime": float, "cached_at": float}
+        self.garak_reports_dir = config.garak_reports_path
+        # Plain-string form for hot paths (avoids Path object creation per lookup)
+        self._reports_dir_str = os.fspath(self.garak_reports_dir)
+        # Layer 1: raw JSONL entries  scan_id → {"entries": (...), "mtime": int (ns), "size": int,
+        #                                         "digest": bytes, "cached_at": float}
         self._report_cache: Dict[str, Dict[str, Any]] = {}
         # Layer 2 (scan info) removed — DB handles metadata queries now
-        # Layer 3: full results      scan_id → {"data": {...}, "mtime": float}
+        # Layer 3: full results      scan_id → {"data": {...}, "mtime": int (ns)}
         self._results_cache: Dict[str, Dict[str, Any]] = {}
+        # Per-probe breakdown       scan_id → (entries it was built from, sorted probe rows)
+        self._probe_details_cache: Dict[str, Tuple[ReportEntries, Tuple[Dict[str, Any], ...]]] = {}
+        # Per-scan summaries        scan_id → {"entries": (...), "tally": Counter, "scan_info": {...},
+        #                                         "probe_stats": {...}}
+        # (valid only while "entries" is the object Layer 1 currently holds)
+        self._summary_cache: Dict[str, Dict[str, Any]] = {}
         self._cache_ttl = cache_ttl
+        # Monotonic clock (seconds) used for all TTL checks; injectable for tests
+        self._clock = clock
+        # Guards the cache dicts; _inflight coalesces concurrent misses so
+        # only one thread parses a given report while the others wait.
+        self._cache_lock = threading.RLock()
+        self._inflight: Dict[str, threading.Event] = {}
+        # Negative cache: scan_id → monotonic time of the last full miss.
+        # Short-circuits repeated polling for ids that have no report.
+        self._negative_cache: OrderedDict[str, float] = OrderedDict()
+        self._negative_ttl = NEGATIVE_CACHE_TTL
         logger.info(f"Garak service URL: {self.garak_service_url}")
         logger.info(f"Garak reports directory: {self.garak_reports_dir}")
 
+    @property
+    def _config(self):
+        """Settings in effect: the injected object, else config.settings."""
+        return self._settings if self._settings is not None else settings
+
     # ------------------------------------------------------------------
     # Database sync helpers
     # ------------------------------------------------------------------
@@ -217,7 +395,7 @@ class GarakWrapper:
         """
         # Enforce concurrent scan limit
         running = self._count_running_scans()
-        limit = settings.max_concurrent_scans
+        limit = self._config.max_concurrent_scans
         if running >= limit:
             raise MaxConcurrentScansError(running, limit)
 
@@ -382,6 +560,7 @@ class GarakWrapper:
                 scan_info["html_report_path"] = final_path
             elif rtype == "jsonl":
                 scan_info["jsonl_report_path"] = final_path
+                self._forget_missing(scan_id)
             self._sync_scan_to_db(scan_id)
 
         elif etype == "complete":
@@ -396,6 +575,7 @@ class GarakWrapper:
                 scan_info["report_key"] = report_keys["jsonl"]
             if report_keys.get("html"):
                 scan_info["html_report_key"] = report_keys["html"]
+            self._forget_missing(scan_id)
             self._sync_scan_to_db(scan_id)
 
         elif etype == "error":
@@ -494,12 +674,19 @@ class GarakWrapper:
     # Report reading (object store → local filesystem fallback)
     # ------------------------------------------------------------------
 
+    @staticmethod
+    def _snapshot_active_scan(scan_info: Dict[str, Any]) -> Dict[str, Any]:
+        """Copy an active scan's info for callers, minus the process handle."""
+        snapshot = dict(scan_info)
+        snapshot.pop("process", None)
+        return snapshot
+
     def get_scan_status(self, scan_id: str) -> Optional[Dict[str, Any]]:
         """Get current status of a scan (active or historical)."""
         # Check active scans first (real-time data)
         scan_info = self.active_scans.get(scan_id)
         if scan_info:
-            return {k: v for k, v in scan_info.items() if k != "process"}
+            return self._snapshot_active_scan(scan_info)
 
         # Check database for historical scans
         if _db_available():
@@ -514,10 +701,9 @@ class GarakWrapper:
                 logger.warning(f"DB lookup failed for scan {scan_id}, falling back to file: {e}")
 
         # Fallback: check historical scans on disk
-        if self.garak_reports_dir.exists():
-            report_file = self.garak_reports_dir / f"garak.{scan_id}.report.jsonl"
-            if report_file.exists():
-                return self._parse_report_file(report_file, scan_id)
+        report_path = f"{self._reports_dir_str}/garak.{scan_id}.report.jsonl"
+        if os.path.exists(report_path):
+            return self._parse_report_file(Path(report_path), scan_id)
 
         return None
 
@@ -587,8 +773,7 @@ class GarakWrapper:
 
         # Active scans (real-time data)
         for scan_info in self.active_scans.values():
-            scan_copy = {k: v for k, v in scan_info.items() if k != "process"}
-            all_scans.append(scan_copy)
+            all_scans.append(self._snapshot_active_scan(scan_info))
             active_ids.add(scan_info.get("scan_id"))
 
         # Historical scans from database
@@ -611,17 +796,30 @@ class GarakWrapper:
             return sorted(all_scans, key=lambda x: x.get("started_at", ""), reverse=True)
 
         try:
-            report_files = list(self.garak_reports_dir.glob("garak.*.report.jsonl"))
-            for report_file in report_files:
-                try:
-                    scan_id = report_file.stem.replace("garak.", "").replace(".report", "")
+            listed_ids = set()
+            # scandir yields the name and file type from the directory read
+            # itself, so non-report entries cost no extra stat() calls
+            with os.scandir(self._reports_dir_str) as it:
+                for entry in it:
+                    name = entry.name
+                    if (
+                        len(name) < REPORT_NAME_MIN_LEN
+                        or not name.startswith(REPORT_PREFIX)
+                        or not name.endswith(REPORT_SUFFIX)
+                        or not entry.is_file()
+                    ):
+                        continue
+                    scan_id = name[len(REPORT_PREFIX):-len(REPORT_SUFFIX)]
+                    listed_ids.add(scan_id)
                     if scan_id in active_ids:
                         continue
-                    scan_info = self._parse_report_file(report_file, scan_id)
-                    if scan_info:
-                        all_scans.append(scan_info)
-                except Exception as e:
-                    logger.error(f"Error parsing report file {report_file}: {e}")
+                    try:
+                        scan_info = self._parse_report_file(Path(entry.path), scan_id)
+                        if scan_info:
+                            all_scans.append(scan_info)
+                    except Exception as e:
+                        logger.error(f"Error parsing report file {entry.path}: {e}")
+            self._prune_summaries(listed_ids)
         except Exception as e:
             logger.error(f"Error reading reports directory: {e}")
 
@@ -631,7 +829,7 @@ class GarakWrapper:
     # Report cache
     # ------------------------------------------------------------------
 
-    def _get_report_entries(self, scan_id: str) -> Optional[List[dict]]:
+    def _get_report_entries(self, scan_id: str) -> Optional[ReportEntries]:
         """Get parsed JSONL entries for a scan, using cache when valid.
 
         Lookup order:
@@ -645,63 +843,151 @@ class GarakWrapper:
         - File mtime changes (file was rewritten) — local filesystem only
         - TTL expires — local filesystem only
         - invalidate_cache() is called (e.g. on delete)
+
+        A scan_id that no source has is remembered as missing for
+        NEGATIVE_CACHE_TTL seconds, so repeated polling for an unknown id
+        does not hit Minio, the filesystem, the DB and the garak service
+        on every call.
+
+        Entries are returned frozen (a tuple of read-only mappings) because
+        the same object is handed to every caller while it stays cached.
+
+        Safe to call from multiple threads: concurrent misses for the same
+        scan_id are coalesced so the report is only loaded once, and the
+        waiting threads re-read the cache when the loading thread is done.
         """
-        # Check in-memory cache first
-        now = time.monotonic()
-        cached = self._report_cache.get(scan_id)
-        if cached and cached.get("immutable"):
-            # Object-store-sourced data — cache forever (write-once)
-            return cached["entries"]
+        while True:
+            with self._cache_lock:
+                cached = self._report_cache.get(scan_id)
+                if cached and cached.get("immutable"):
+                    # Object-store-sourced data — cache forever (write-once)
+                    return cached["entries"]
+                missed_at = self._negative_cache.get(scan_id)
+                if missed_at is not None:
+                    if self._clock() - missed_at < self._negative_ttl:
+                        # Recently looked everywhere and found nothing
+                        return None
+                    del self._negative_cache[scan_id]
+            # Local file unchanged since it was parsed: a stat is all it takes
+            if cached is not None and self._local_entry_is_current(scan_id, cached):
+                return cached["entries"]
+            with self._cache_lock:
+                cached = self._report_cache.get(scan_id)
+                inflight = self._inflight.get(scan_id)
+                if inflight is None:
+                    event = threading.Event()
+                    self._inflight[scan_id] = event
+                    break
+            # Another thread is loading this report — wait, then re-check
+            inflight.wait()
+
+        try:
+            entries = self._load_report_entries(scan_id, cached)
+            if entries is None:
+                self._remember_missing(scan_id)
+            return entries
+        finally:
+            with self._cache_lock:
+                self._inflight.pop(scan_id, None)
+            event.set()
+
+    def _local_entry_is_current(self, scan_id: str, cached: Dict[str, Any]) -> bool:
+        """Whether a cached local-file entry still matches the file on disk."""
+        if self._clock() - cached["cached_at"] >= self._cache_ttl:
+            return False
+        try:
+            st = os.stat(f"{self._reports_dir_str}/garak.{scan_id}.report.jsonl")
+        except OSError:
+            return False
+        return cached.get("mtime") == st.st_mtime_ns and cached.get("size") == st.st_size
+
+    def _load_report_entries(
+        self, scan_id: str, cached: Optional[Dict[str, Any]]
+    ) -> Optional[ReportEntries]:
+        """Load entries from the first source that has them (cache miss path).
+
+        Only called by the thread that owns the in-flight marker for scan_id.
+        """
+        now = self._clock()
 
         # Try object store (Minio)
         entries = self._read_entries_from_object_store(scan_id)
         if entries is not None:
-            self._report_cache[scan_id] = {
+            entries = _freeze_entries(entries)
+            self._store_report_entries(scan_id, {
                 "entries": entries,
                 "immutable": True,  # Objects in Minio are write-once
                 "cached_at": now,
-            }
+            })
             return entries
 
         # Fallback: local filesystem
-        report_file = self.garak_reports_dir / f"garak.{scan_id}.report.jsonl"
-        if report_file.exists():
-            try:
-                file_mtime = report_file.stat().st_mtime
-            except OSError:
-                file_mtime = None
-
-            if file_mtime is not None:
-                # Check if local file cache is still valid
-                if (
-                    cached
-                    and cached.get("mtime") == file_mtime
-                    and (now - cached["cached_at"]) < self._cache_ttl
-                ):
-                    return cached["entries"]
-
-                # Parse local file
-                entries = self._parse_local_report(report_file)
-                if entries is not None:
-                    self._report_cache[scan_id] = {
-                        "entries": entries,
-                        "mtime": file_mtime,
-                        "cached_at": now,
-                    }
-                    return entries
+        report_path = f"{self._reports_dir_str}/garak.{scan_id}.report.jsonl"
+        try:
+            st = os.stat(report_path)
+        except OSError:
+            st = None
+
+        if st is not None:
+            file_mtime = st.st_mtime_ns
+            file_size = st.st_size
+            same_size = cached is not None and cached.get("size") == file_size
+            # Check if local file cache is still valid
+            if (same_size and cached.get("mtime") == file_mtime
+                    and (now - cached["cached_at"]) < self._cache_ttl):
+                return cached["entries"]
+
+            data = self._read_local_report(report_path)
+            if data is not None:
+                # A size change already proves new content, so only hash
+                # when the bytes could still match (or nothing is cached)
+                digest = _content_digest(data) if cached is None or same_size else None
+                if same_size and cached.get("digest") == digest:
+                    # Same bytes (re-synced, or just past the TTL): keep the
+                    # parsed entries and only record the new mtime
+                    entries = cached["entries"]
+                else:
+                    entries = _freeze_entries(self._parse_local_report(data))
+                self._store_report_entries(scan_id, {
+                    "entries": entries,
+                    "mtime": file_mtime,
+                    "size": file_size,
+                    "digest": digest,
+                    "cached_at": now,
+                })
+                return entries
 
         # Fallback: fetch from garak service via HTTP
         entries = self._fetch_report_from_garak_service(scan_id)
         if entries is not None:
-            self._report_cache[scan_id] = {
+            entries = _freeze_entries(entries)
+            self._store_report_entries(scan_id, {
                 "entries": entries,
                 "immutable": True,
                 "cached_at": now,
-            }
+            })
             return entries
 
         return None
 
+    def _store_report_entries(self, scan_id: str, cache_entry: Dict[str, Any]) -> None:
+        """Insert a Layer 1 cache entry under the cache lock."""
+        with self._cache_lock:
+            self._report_cache[scan_id] = cache_entry
+
+    def _remember_missing(self, scan_id: str) -> None:
+        """Record that no source had a report for scan_id."""
+        with self._cache_lock:
+            self._negative_cache[scan_id] = self._clock()
+            self._negative_cache.move_to_end(scan_id)
+            while len(self._negative_cache) > NEGATIVE_CACHE_MAX:
+                self._negative_cache.popitem(last=False)
+
+    def _forget_missing(self, scan_id: str) -> None:
+        """Drop a negative cache entry (a report for scan_id now exists)."""
+        with self._cache_lock:
+            self._negative_cache.pop(scan_id, None)
+
     def _read_entries_from_object_store(self, scan_id: str) -> Optional[List[dict]]:
         """Try to read JSONL entries from the object store (Minio).
 
@@ -718,14 +1004,7 @@ class GarakWrapper:
             if data is None:
                 return None
 
-            entries = []
-            for line in data.decode("utf-8").splitlines():
-                line = line.strip()
-                if line:
-                    try:
-                        entries.append(json.loads(line))
-                    except json.JSONDecodeError:
-                        continue
+            entries = _parse_jsonl(data)
             return entries if entries else None
 
         except Exception as e:
@@ -733,23 +1012,22 @@ class GarakWrapper:
             return None
 
     @staticmethod
-    def _parse_local_report(report_file: Path) -> Optional[List[dict]]:
-        """Parse a local JSONL report file into entries.
+    def _read_local_report(report_file: Union[str, Path]) -> Optional[bytes]:
+        """Read a local JSONL report file's raw bytes.
 
-        Returns a list (possibly empty) on success, or None on read error.
+        Returns None on read error.
         """
-        entries = []
         try:
-            with open(report_file, "r", encoding="utf-8") as f:
-                for line in f:
-                    try:
-                        entries.append(json.loads(line))
-                    except json.JSONDecodeError:
-                        continue
+            with open(report_file, "rb") as f:
+                return f.read()
         except Exception as e:
             logger.error(f"Error reading report file {report_file}: {e}")
             return None
-        return entries
+
+    @staticmethod
+    def _parse_local_report(data: bytes) -> List[dict]:
+        """Parse the raw bytes of a local JSONL report into entries."""
+        return _parse_jsonl(data)
 
     def _fetch_report_from_garak_service(self, scan_id: str) -> Optional[List[dict]]:
         """Fetch a report file from the garak service via HTTP.
@@ -775,15 +1053,8 @@ class GarakWrapper:
                 logger.debug(f"Garak service returned {resp.status_code} for {filename}")
                 return None
 
-            content = resp.text
-            entries = []
-            for line in content.splitlines():
-                line = line.strip()
-                if line:
-                    try:
-                        entries.append(json.loads(line))
-                    except json.JSONDecodeError:
-                        continue
+            data = resp.text.encode("utf-8")
+            entries = _parse_jsonl(data)
 
             if not entries:
                 return None
@@ -791,7 +1062,7 @@ class GarakWrapper:
             logger.info(f"Fetched {len(entries)} entries from garak service for {scan_id}")
 
             # Upload to Minio so future reads don't need the garak service
-            self._upload_fetched_report_to_object_store(scan_id, content.encode("utf-8"))
+            self._upload_fetched_report_to_object_store(scan_id, data)
 
             return entries
 
@@ -841,39 +1112,45 @@ class GarakWrapper:
 
     def invalidate_cache(self, scan_id: str):
         """Remove all cached data for a scan."""
-        self._report_cache.pop(scan_id, None)
-        self._results_cache.pop(scan_id, None)
+        with self._cache_lock:
+            self._report_cache.pop(scan_id, None)
+            self._results_cache.pop(scan_id, None)
+            self._probe_details_cache.pop(scan_id, None)
+            self._summary_cache.pop(scan_id, None)
+            self._negative_cache.pop(scan_id, None)
 
     def clear_cache(self):
         """Remove all cached data."""
-        self._report_cache.clear()
-        self._results_cache.clear()
+        with self._cache_lock:
+            self._report_cache.clear()
+            self._results_cache.clear()
+            self._probe_details_cache.clear()
+            self._summary_cache.clear()
+            self._negative_cache.clear()
 
     def _parse_report_file(self, report_file: Path, scan_id: str) -> Optional[Dict[str, Any]]:
         """Parse a garak report.jsonl file to extract scan information.
 
         This is the file fallback path — only used when the DB is unavailable.
-        Uses Layer 1 (raw entries) for processing.
+        Uses Layer 1 (raw entries) for processing; the entry-derived counts
+        are memoized per entries object, so an unchanged report is not
+        re-scanned on every listing.
         """
         entries = self._get_report_entries(scan_id)
         if not entries:
             return None
 
         try:
-            first_entry = entries[0]
-
-            scan_info = {
-                "scan_id": scan_id,
-                "status": "completed",
-                "target_type": first_entry.get("plugins.target_type", "unknown"),
-                "target_name": first_entry.get("plugins.target_name", "unknown"),
-                "started_at": first_entry.get("transient.starttime_iso", ""),
-                "completed_at": first_entry.get("transient.endtime_iso", ""),
-                "passed": 0,
-                "failed": 0,
-                "total_tests": 0,
-                "progress": 100.0,
-            }
+            summary = self._get_summary(scan_id, entries)
+            base_info = summary.get("scan_info")
+            if base_info is None:
+                base_info = self._summarize_entries(
+                    scan_id, entries, self._get_attempt_tally(summary)
+                )
+                summary["scan_info"] = base_info
+
+            # Callers own the returned dict; keep the memoized one pristine
+            scan_info = dict(base_info)
 
             html_report_path = report_file.parent / f"garak.{scan_id}.report.html"
             if html_report_path.exists():
@@ -881,17 +1158,6 @@ class GarakWrapper:
 
             scan_info["jsonl_report_path"] = str(report_file)
 
-            for entry in entries:
-                entry_type = entry.get("entry_type")
-                if entry_type == "attempt" and entry.get("status") in [1, 2]:
-                    scan_info["total_tests"] += 1
-                    if entry["status"] == 2:
-                        scan_info["passed"] += 1
-                    elif entry["status"] == 1:
-                        scan_info["failed"] += 1
-                elif entry_type == "digest":
-                    scan_info["digest"] = entry.get("eval", {})
-
             if not scan_info["started_at"]:
                 try:
                     file_mtime = report_file.stat().st_mtime
@@ -906,6 +1172,84 @@ class GarakWrapper:
             logger.error(f"Error parsing report file {report_file}: {e}")
             return None
 
+    @staticmethod
+    def _summarize_entries(
+        scan_id: str, entries: ReportEntries, tally: Counter
+    ) -> Dict[str, Any]:
+        """Build the entry-derived part of a historical scan's info dict."""
+        first_entry = entries[0]
+
+        passed = failed = 0
+        for (_probe, status_val), count in tally.items():
+            if status_val == 2:
+                passed += count
+            elif status_val == 1:
+                failed += count
+
+        scan_info = {
+            "scan_id": scan_id,
+            "status": "completed",
+            "target_type": first_entry.get("plugins.target_type", "unknown"),
+            "target_name": first_entry.get("plugins.target_name", "unknown"),
+            "started_at": first_entry.get("transient.starttime_iso", ""),
+            "completed_at": first_entry.get("transient.endtime_iso", ""),
+            "passed": passed,
+            "failed": failed,
+            "total_tests": passed + failed,
+            "progress": 100.0,
+        }
+
+        # The digest is written last; search from the end
+        for entry in reversed(entries):
+            if entry.get("entry_type") == "digest":
+                scan_info["digest"] = entry.get("eval", {})
+                break
+
+        return scan_info
+
+    @staticmethod
+    def _tally_attempts(entries: ReportEntries) -> Counter:
+        """Count attempts per (probe_classname, status) in a single pass.
+
+        Shared by the scan summary and the per-category stats so a report's
+        attempts are only walked once.
+        """
+        return Counter(
+            (entry.get("probe_classname", "unknown"), entry.get("status"))
+            for entry in entries
+            if entry.get("entry_type") == "attempt"
+        )
+
+    def _get_attempt_tally(self, summary: Dict[str, Any]) -> Counter:
+        """Return the memoized attempt tally for a summary record."""
+        tally = summary.get("tally")
+        if tally is None:
+            tally = summary["tally"] = self._tally_attempts(summary["entries"])
+        return tally
+
+    def _get_summary(self, scan_id: str, entries: ReportEntries) -> Dict[str, Any]:
+        """Return the memoized summary record for scan_id's current entries.
+
+        A record built from an older entries object (the report was
+        reparsed) is replaced with an empty one.
+        """
+        summary = self._summary_cache.get(scan_id)
+        if summary is None or summary["entries"] is not entries:
+            summary = {"entries": entries}
+            with self._cache_lock:
+                self._summary_cache[scan_id] = summary
+        return summary
+
+    def _prune_summaries(self, listed_ids: set) -> None:
+        """Drop summaries of local reports that have disappeared from disk."""
+        with self._cache_lock:
+            for scan_id in list(self._summary_cache):
+                if scan_id in listed_ids:
+                    continue
+                cached = self._report_cache.get(scan_id)
+                if cached is None or not cached.get("immutable"):
+                    del self._summary_cache[scan_id]
+
     def get_scan_results(self, scan_id: str) -> Optional[Dict[str, Any]]:
         """Get detailed scan results including probe-level breakdown.
 
@@ -922,19 +1266,20 @@ class GarakWrapper:
             return cached["data"]
 
         # Check local filesystem for mtime-based cache
-        report_file = self.garak_reports_dir / f"garak.{scan_id}.report.jsonl"
-        if report_file.exists():
-            try:
-                file_mtime = report_file.stat().st_mtime
-            except OSError:
-                file_mtime = None
+        report_path = f"{self._reports_dir_str}/garak.{scan_id}.report.jsonl"
+        try:
+            file_mtime = os.stat(report_path).st_mtime_ns
+        except OSError:
+            file_mtime = None
 
-            if file_mtime is not None and cached and cached.get("mtime") == file_mtime:
+        if file_mtime is not None:
+            if cached and cached.get("mtime") == file_mtime:
                 return cached["data"]
 
             result = self._build_results(scan_id)
-            if result and file_mtime is not None:
-                self._results_cache[scan_id] = {"data": result, "mtime": file_mtime}
+            if result:
+                with self._cache_lock:
+                    self._results_cache[scan_id] = {"data": result, "mtime": file_mtime}
             return result
 
         # Delegate to _get_report_entries which handles Minio, local, and
@@ -943,7 +1288,8 @@ class GarakWrapper:
         if entries is not None:
             result = self._build_results(scan_id)
             if result:
-                self._results_cache[scan_id] = {"data": result, "immutable": True}
+                with self._cache_lock:
+                    self._results_cache[scan_id] = {"data": result, "immutable": True}
             return result
 
         return None
@@ -1056,14 +1402,57 @@ class GarakWrapper:
     ) -> Optional[Dict[str, Any]]:
         """Parse JSONL report and return per-probe breakdown with security context.
 
-        Uses cached JSONL entries when available.
+        Uses cached JSONL entries when available.  The enriched, sorted
+        per-probe rows are cached for as long as the scan's entries stay
+        cached, so repeated dashboard refreshes only filter and paginate.
         """
-        from services.probe_knowledge import get_probe_metadata
-
         entries = self._get_report_entries(scan_id)
         if entries is None:
             return None
 
+        cached = self._probe_details_cache.get(scan_id)
+        if cached is not None and cached[0] is entries:
+            probe_results = cached[1]
+        else:
+            probe_results = self._build_probe_details(entries)
+            with self._cache_lock:
+                self._probe_details_cache[scan_id] = (entries, probe_results)
+
+        # Apply optional filter (rows are already sorted, filtering keeps order)
+        if probe_filter:
+            pf = probe_filter.lower()
+            probe_results = [
+                p for p in probe_results
+                if pf in p["probe_classname"].lower()
+                or pf in p["security"]["category"].lower()
+            ]
+
+        # Paginate
+        total_probes = len(probe_results)
+        start = (page - 1) * page_size
+        end = start + page_size
+
+        return {
+            "scan_id": scan_id,
+            "total_probes": total_probes,
+            "page": page,
+            "page_size": page_size,
+            # Cached rows are shared between requests, so hand out copies
+            # (the security dict too, as get_probe_metadata returns a fresh one)
+            "probes": [
+                {**row, "security": dict(row["security"])}
+                for row in probe_results[start:end]
+            ],
+        }
+
+    @staticmethod
+    def _build_probe_details(entries: ReportEntries) -> Tuple[Dict[str, Any], ...]:
+        """Aggregate attempts per probe, enrich with the knowledge base and sort.
+
+        Rows are ordered worst pass rate first.
+        """
+        from services.probe_knowledge import get_probe_metadata
+
         probes_data: Dict[str, Dict[str, Any]] = {}
 
         for entry in entries:
@@ -1102,7 +1491,7 @@ class GarakWrapper:
 
             probe_results.append({
                 "probe_classname": probe_name,
-                "category": probe_name.split(".")[0],
+                "category": _probe_category(probe_name),
                 "passed": data["passed"],
                 "failed": data["failed"],
                 "total": total,
@@ -1111,30 +1500,9 @@ class GarakWrapper:
                 "security": metadata,
             })
 
-        # Apply optional filter
-        if probe_filter:
-            pf = probe_filter.lower()
-            probe_results = [
-                p for p in probe_results
-                if pf in p["probe_classname"].lower()
-                or pf in p["security"]["category"].lower()
-            ]
-
         # Sort: worst pass rate first
         probe_results.sort(key=lambda p: p["pass_rate"])
-
-        # Paginate
-        total_probes = len(probe_results)
-        start = (page - 1) * page_size
-        end = start + page_size
-
-        return {
-            "scan_id": scan_id,
-            "total_probes": total_probes,
-            "page": page,
-            "page_size": page_size,
-            "probes": probe_results[start:end],
-        }
+        return tuple(probe_results)
 
     def get_probe_attempts(
         self,
@@ -1214,25 +1582,31 @@ class GarakWrapper:
         """Compute per-category probe stats from JSONL entries.
 
         Returns dict like: {"dan": {"passed": 10, "failed": 3}, ...}
-        Returns None if JSONL is unavailable.
+        Returns None if JSONL is unavailable.  The result is memoized with
+        the scan's summary, so callers must treat it as read-only.
         """
         entries = self._get_report_entries(scan_id)
         if not entries:
             return None
 
+        summary = self._get_summary(scan_id, entries)
+        if "probe_stats" not in summary:
+            summary["probe_stats"] = self._tally_probe_stats(self._get_attempt_tally(summary))
+        return summary["probe_stats"]
+
+    @staticmethod
+    def _tally_probe_stats(tally: Counter) -> Optional[Dict[str, Dict[str, int]]]:
+        """Fold a (probe, status) attempt tally into per-category passed/failed counts."""
         stats: Dict[str, Dict[str, int]] = {}
-        for entry in entries:
-            if entry.get("entry_type") != "attempt":
-                continue
-            probe_name = entry.get("probe_classname", "unknown")
-            category = probe_name.split(".")[0]
-            if category not in stats:
-                stats[category] = {"passed": 0, "failed": 0}
-            status_val = entry.get("status")
+        for (probe_name, status_val), count in tally.items():
+            category = _probe_category(probe_name)
+            counts = stats.get(category)
+            if counts is None:
+                counts = stats[category] = {"passed": 0, "failed": 0}
             if status_val == 2:
-                stats[category]["passed"] += 1
+                counts["passed"] += count
             elif status_val == 1:
-                stats[category]["failed"] += 1
+                counts["failed"] += count
         return stats if stats else None
 
     def _get_materialized_probe_stats(self, scan_id: str) -> Optional[Dict[str, Dict[str, int]]]:
@@ -1285,9 +1659,8 @@ class GarakWrapper:
         all_scans = self.get_all_scans()
 
         # --- Counters ---
-        status_counts: Dict[str, int] = {
-            "completed": 0, "failed": 0, "cancelled": 0, "running": 0, "pending": 0,
-        }
+        statuses = [scan.get("status", "unknown").lower() for scan in all_scans]
+        status_counts = Counter(statuses)
         total_passed = 0
         total_failed = 0
         pass_rates: List[float] = []
@@ -1296,18 +1669,14 @@ class GarakWrapper:
         probe_agg: Dict[str, Dict[str, int]] = {}  # category → {passed, failed}
 
         # For target breakdown
-        target_agg: Dict[str, Dict[str, Any]] = {}  # "type::name" → {scan_count, pass_rates, last_scanned}
-
-        # For daily trends
-        from collections import defaultdict
-        daily: Dict[str, Dict[str, Any]] = defaultdict(
-            lambda: {"scan_count": 0, "total_passed": 0, "total_failed": 0, "pass_rates": []}
-        )
+        target_agg: Dict[Tuple[str, str], Dict[str, Any]] = {}  # (type, name) → {scan_count, rate_sum, rate_count, last_scanned}
 
-        for scan in all_scans:
-            status = scan.get("status", "unknown").lower()
-            status_counts[status] = status_counts.get(status, 0) + 1
+        # For daily trends: ordinal day → bucket, only for days inside the window
+        today_ord = date.today().toordinal()
+        first_ord = today_ord - days + 1
+        daily: Dict[int, Dict[str, Any]] = {}
 
+        for scan, status in zip(all_scans, statuses):
             passed = scan.get("passed", 0)
             failed = scan.get("failed", 0)
             total_passed += passed
@@ -1320,34 +1689,40 @@ class GarakWrapper:
 
             # Daily trend
             started_at = scan.get("started_at", "")
-            if started_at:
-                try:
-                    day_key = datetime.fromisoformat(started_at).strftime("%Y-%m-%d")
-                    daily[day_key]["scan_count"] += 1
-                    daily[day_key]["total_passed"] += passed
-                    daily[day_key]["total_failed"] += failed
+            if started_at and isinstance(started_at, str):
+                day_ord = _started_day(started_at[:10])
+                if day_ord is not None and first_ord <= day_ord <= today_ord:
+                    bucket = daily.get(day_ord)
+                    if bucket is None:
+                        bucket = daily[day_ord] = {
+                            "scan_count": 0, "total_passed": 0, "total_failed": 0, "pass_rates": [],
+                        }
+                    bucket["scan_count"] += 1
+                    bucket["total_passed"] += passed
+                    bucket["total_failed"] += failed
                     if scan_total > 0:
-                        daily[day_key]["pass_rates"].append((passed / scan_total) * 100.0)
-                except (ValueError, TypeError):
-                    pass
+                        bucket["pass_rates"].append((passed / scan_total) * 100.0)
 
             # Target breakdown
             t_type = scan.get("target_type", "unknown")
             t_name = scan.get("target_name", "unknown")
-            key = f"{t_type}::{t_name}"
+            key = (t_type, t_name)
             if key not in target_agg:
                 target_agg[key] = {
                     "target_type": t_type,
                     "target_name": t_name,
                     "scan_count": 0,
-                    "pass_rates": [],
+                    "rate_sum": 0.0,
+                    "rate_count": 0,
                     "last_scanned": started_at,
                 }
-            target_agg[key]["scan_count"] += 1
+            target = target_agg[key]
+            target["scan_count"] += 1
             if scan_total > 0 and status == "completed":
-                target_agg[key]["pass_rates"].append((passed / scan_total) * 100.0)
-            if started_at and started_at > (target_agg[key]["last_scanned"] or ""):
-                target_agg[key]["last_scanned"] = started_at
+                target["rate_sum"] += (passed / scan_total) * 100.0
+                target["rate_count"] += 1
+            if started_at and started_at > (target["last_scanned"] or ""):
+                target["last_scanned"] = started_at
 
             # Probe failure aggregation (only for completed scans with reports)
             if status == "completed":
@@ -1369,13 +1744,20 @@ class GarakWrapper:
         max_pass_rate = max(pass_rates) if pass_rates else None
 
         # Daily trends (last N days, sorted ascending)
-        today = datetime.now()
         trend_points = []
-        for i in range(days - 1, -1, -1):
-            from datetime import timedelta
-            day = (today - timedelta(days=i)).strftime("%Y-%m-%d")
-            d = daily.get(day, {"scan_count": 0, "total_passed": 0, "total_failed": 0, "pass_rates": []})
-            rates = d["pass_rates"] if isinstance(d.get("pass_rates"), list) else []
+        for day_ord in range(first_ord, today_ord + 1):
+            day = date.fromordinal(day_ord).isoformat()
+            d = daily.get(day_ord)
+            if d is None:
+                trend_points.append({
+                    "date": day,
+                    "scan_count": 0,
+                    "total_passed": 0,
+                    "total_failed": 0,
+                    "avg_pass_rate": 0.0,
+                })
+                continue
+            rates = d["pass_rates"]
             trend_points.append({
                 "date": day,
                 "scan_count": d["scan_count"],
@@ -1384,25 +1766,37 @@ class GarakWrapper:
                 "avg_pass_rate": round(sum(rates) / len(rates), 1) if rates else 0.0,
             })
 
-        # Top failing probes (sorted by failure count descending, top 10)
+        # Top failing probes (by failure count descending, top 10).  nlargest
+        # keeps sorted()'s tie order but never sorts the full category list.
+        top_categories = heapq.nlargest(
+            10,
+            (item for item in probe_agg.items() if item[1]["passed"] + item[1]["failed"] > 0),
+            key=lambda item: item[1]["failed"],
+        )
         top_probes = []
-        for category, counts in probe_agg.items():
+        for category, counts in top_categories:
             cat_total = counts["passed"] + counts["failed"]
-            if cat_total > 0:
-                top_probes.append({
-                    "probe_category": category,
-                    "failure_count": counts["failed"],
-                    "total_count": cat_total,
-                    "failure_rate": round(counts["failed"] / cat_total * 100.0, 1),
-                })
-        top_probes.sort(key=lambda p: p["failure_count"], reverse=True)
-
-        # Target breakdown (sorted by scan count descending)
-        targets = []
-        for info in target_agg.values():
-            rates = info.pop("pass_rates", [])
-            info["avg_pass_rate"] = round(sum(rates) / len(rates), 1) if rates else 0.0
-            targets.append(info)
+            top_probes.append({
+                "probe_category": category,
+                "failure_count": counts["failed"],
+                "total_count": cat_total,
+                "failure_rate": round(counts["failed"] / cat_total * 100.0, 1),
+            })
+
+        # Target breakdown (every target, sorted by scan count descending)
+        targets = [
+            {
+                "target_type": info["target_type"],
+                "target_name": info["target_name"],
+                "scan_count": info["scan_count"],
+                "last_scanned": info["last_scanned"],
+                "avg_pass_rate": (
+                    round(info["rate_sum"] / info["rate_count"], 1)
+                    if info["rate_count"] else 0.0
+                ),
+            }
+            for info in target_agg.values()
+        ]
         targets.sort(key=lambda t: t["scan_count"], reverse=True)
 
         return {
@@ -1419,7 +1813,7 @@ class GarakWrapper:
             "min_pass_rate": round(min_pass_rate, 1) if min_pass_rate is not None else None,
             "max_pass_rate": round(max_pass_rate, 1) if max_pass_rate is not None else None,
             "daily_trends": trend_points,
-            "top_failing_probes": top_probes[:10],
+            "top_failing_probes": top_probes,
             "target_breakdown": targets,
         }
 
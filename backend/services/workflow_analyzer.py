@@ -5,7 +5,9 @@ Parses Garak output to build workflow graphs showing probe-LLM interactions
 import re
 import time
 import json
-from typing import Dict, List, Optional, Any, Set
+from collections import Counter
+from sys import intern
+from typing import Dict, Iterable, Iterator, List, Optional, Any, Set, Tuple
 from uuid import uuid4
 
 from models.schemas import (
@@ -19,6 +21,19 @@ from models.schemas import (
     WorkflowTimelineEvent
 )
 
+# Pattern matchers for actual garak CLI output
+
+# probes.atkgen.Tox:  32%|███▏      | 8/25 [02:14<04:50, 17.09s/it]
+_PROBE_PROGRESS_RE = re.compile(r'probes\.(\S+?):\s+(\d+)%')
+# turn 01: waiting for [llama3.2:3]:  10%|█         | 1/10
+_MODEL_TURN_RE = re.compile(r'turn\s+(\d+):\s+waiting for \[([^\]]+)\]')
+# turn 02: red teaming [attackgene]:  20%|██        | 2/10
+_GENERATOR_TURN_RE = re.compile(r'turn\s+(\d+):\s+red teaming \[([^\]]+)\]')
+# atkgen.Tox  toxicity.ToxicityDetector: PASS  ok on  29/29
+_PROBE_RESULT_RE = re.compile(
+    r'([\w\.]+)\s+([\w\.]+):\s+(PASS|FAIL)\s+ok on\s+(\d+)\s*/\s*(\d+)'
+)
+
 
 class WorkflowAnalyzer:
     """Analyzes Garak output to build workflow graphs"""
@@ -30,30 +45,8 @@ class WorkflowAnalyzer:
         self._seen_probes: Dict[str, Set[str]] = {}
         # Track current probe per scan for linking edges
         self._current_probe: Dict[str, str] = {}
-
-        # Pattern matchers for actual garak CLI output
-        self.patterns = {
-            # probes.atkgen.Tox:  32%|███▏      | 8/25 [02:14<04:50, 17.09s/it]
-            'probe_progress': re.compile(
-                r'probes\.(\S+?):\s+(\d+)%'
-            ),
-            # turn 01: waiting for [llama3.2:3]:  10%|█         | 1/10
-            'model_turn': re.compile(
-                r'turn\s+(\d+):\s+waiting for \[([^\]]+)\]'
-            ),
-            # turn 02: red teaming [attackgene]:  20%|██        | 2/10
-            'generator_turn': re.compile(
-                r'turn\s+(\d+):\s+red teaming \[([^\]]+)\]'
-            ),
-            # atkgen.Tox  toxicity.ToxicityDetector: PASS  ok on  29/29
-            'probe_result': re.compile(
-                r'([\w\.]+)\s+([\w\.]+):\s+(PASS|FAIL)\s+ok on\s+(\d+)\s*/\s*(\d+)'
-            ),
-            # 1 3/51 [00:52<13:08, 16.44s/it]  (overall probe counter)
-            'overall_progress': re.compile(
-                r'^\s*\d+\s+(\d+)/(\d+)\s+\['
-            ),
-        }
+        # Last exports per scan: (graph, change key, {format: output})
+        self._export_cache: Dict[str, Tuple[WorkflowGraph, Tuple[int, int, int], Dict[str, str]]] = {}
 
     def get_or_create_workflow(self, scan_id: str) -> WorkflowGraph:
         """Get existing workflow or create new one"""
@@ -87,6 +80,47 @@ class WorkflowAnalyzer:
             Dictionary with parsed event data or None
         """
         workflow = self.get_or_create_workflow(scan_id)
+        return self._process_line(workflow, scan_id, output_line)
+
+    def process_garak_output_batch(self, scan_id: str,
+                                   output_lines: Iterable[str]) -> List[Dict[str, Any]]:
+        """
+        Process several lines of Garak output for one scan
+
+        Args:
+            scan_id: Scan identifier
+            output_lines: Lines from Garak output, in order
+
+        Returns:
+            Parsed event dicts for the lines that matched, in order
+        """
+        return list(self.process_garak_stream(scan_id, output_lines))
+
+    def process_garak_stream(self, scan_id: str,
+                             output_lines: Iterable[str]) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily process a stream of Garak output lines for one scan
+
+        The workflow is resolved once for the whole stream rather than once
+        per line, and each line is applied to the graph as it is consumed.
+
+        Args:
+            scan_id: Scan identifier
+            output_lines: Lines from Garak output, in order (may be lazy)
+
+        Yields:
+            Parsed event dicts for the lines that matched, in order
+        """
+        workflow = self.get_or_create_workflow(scan_id)
+        process_line = self._process_line
+        for output_line in output_lines:
+            event = process_line(workflow, scan_id, output_line)
+            if event is not None:
+                yield event
+
+    def _process_line(self, workflow: WorkflowGraph, scan_id: str,
+                      output_line: str) -> Optional[Dict[str, Any]]:
+        """Match one output line against the garak patterns and apply it."""
         line = output_line.strip()
 
         if not line:
@@ -95,28 +129,32 @@ class WorkflowAnalyzer:
         timestamp = time.time()
         event = None
 
-        # Check for probe progress (first seen = probe start)
-        if match := self.patterns['probe_progress'].search(line):
-            probe_name = match.group(1)
+        # Check for probe progress (first seen = probe start).  Each pattern
+        # is only tried when a literal it requires is present, so the bulk
+        # of garak's stdout (noise) never reaches the regexes.
+        if "probes." in line and (match := _PROBE_PROGRESS_RE.search(line)):
+            # Names come from a small fixed vocabulary; interning makes
+            # repeated matches share one string object
+            probe_name = intern(match.group(1))
             percent = int(match.group(2))
             event = self._handle_probe_progress(workflow, scan_id, probe_name, percent, timestamp)
 
         # Check for model turn (waiting for model response)
-        elif match := self.patterns['model_turn'].search(line):
+        elif "waiting for [" in line and (match := _MODEL_TURN_RE.search(line)):
             turn_num = int(match.group(1))
-            model_name = match.group(2)
+            model_name = intern(match.group(2))
             event = self._handle_model_turn(workflow, scan_id, model_name, turn_num, timestamp)
 
         # Check for generator turn (red teaming)
-        elif match := self.patterns['generator_turn'].search(line):
+        elif "red teaming [" in line and (match := _GENERATOR_TURN_RE.search(line)):
             turn_num = int(match.group(1))
-            generator_name = match.group(2)
+            generator_name = intern(match.group(2))
             event = self._handle_generator_turn(workflow, scan_id, generator_name, turn_num, timestamp)
 
         # Check for probe result (PASS/FAIL with detector)
-        elif match := self.patterns['probe_result'].search(line):
-            probe_name = match.group(1)
-            detector_name = match.group(2)
+        elif "ok on" in line and (match := _PROBE_RESULT_RE.search(line)):
+            probe_name = intern(match.group(1))
+            detector_name = intern(match.group(2))
             result = match.group(3)
             passed = int(match.group(4))
             total = int(match.group(5))
@@ -125,6 +163,9 @@ class WorkflowAnalyzer:
                 result, passed, total, timestamp
             )
 
+        if event is not None:
+            # Handlers also update node metadata in place
+            workflow.touch()
         return event
 
     def _ensure_probe_node(self, workflow: WorkflowGraph, scan_id: str,
@@ -132,9 +173,9 @@ class WorkflowAnalyzer:
         """Create a probe node if not already seen. Returns node_id."""
         if probe_name in self._seen_probes.get(scan_id, set()):
             # Find existing node_id
-            for node in workflow.nodes:
-                if node.node_type == WorkflowNodeType.PROBE and node.name == probe_name:
-                    return node.node_id
+            node = workflow.find(WorkflowNodeType.PROBE, probe_name)
+            if node is not None:
+                return node.node_id
             # Shouldn't happen, but generate a new one
             return f"probe_{probe_name.replace('.', '_')}"
 
@@ -147,7 +188,7 @@ class WorkflowAnalyzer:
             metadata={'status': 'running'},
             timestamp=timestamp
         )
-        workflow.nodes.append(node)
+        workflow.add_node(node)
         self._seen_probes.setdefault(scan_id, set()).add(probe_name)
         workflow.statistics['probes_executed'] = workflow.statistics.get('probes_executed', 0) + 1
 
@@ -181,10 +222,9 @@ class WorkflowAnalyzer:
         self._current_probe[scan_id] = probe_name
 
         # Update progress in the probe node metadata
-        for node in workflow.nodes:
-            if node.node_id == node_id:
-                node.metadata['progress'] = percent
-                break
+        node = workflow.find(WorkflowNodeType.PROBE, probe_name)
+        if node is not None:
+            node.metadata['progress'] = percent
 
         return {
             'type': 'probe_progress',
@@ -208,7 +248,7 @@ class WorkflowAnalyzer:
             metadata={'model': model_name, 'turn': turn_num},
             timestamp=timestamp
         )
-        workflow.nodes.append(node)
+        workflow.add_node(node)
         workflow.statistics['total_responses'] = workflow.statistics.get('total_responses', 0) + 1
         workflow.statistics['total_interactions'] = workflow.statistics.get('total_interactions', 0) + 1
 
@@ -227,7 +267,7 @@ class WorkflowAnalyzer:
                     full_content="",
                     metadata={'turn': turn_num}
                 )
-                workflow.edges.append(edge)
+                workflow.add_edge(edge)
                 trace.edges.append(edge)
 
         return {
@@ -252,7 +292,7 @@ class WorkflowAnalyzer:
             metadata={'generator': generator_name, 'turn': turn_num},
             timestamp=timestamp
         )
-        workflow.nodes.append(node)
+        workflow.add_node(node)
         workflow.statistics['total_prompts'] = workflow.statistics.get('total_prompts', 0) + 1
         workflow.statistics['total_interactions'] = workflow.statistics.get('total_interactions', 0) + 1
 
@@ -271,7 +311,7 @@ class WorkflowAnalyzer:
                     full_content="",
                     metadata={'turn': turn_num}
                 )
-                workflow.edges.append(edge)
+                workflow.add_edge(edge)
                 trace.edges.append(edge)
 
         return {
@@ -304,15 +344,14 @@ class WorkflowAnalyzer:
             },
             timestamp=timestamp
         )
-        workflow.nodes.append(det_node)
+        workflow.add_node(det_node)
 
         # Mark probe node as completed
         probe_node_id = f"probe_{probe_name.replace('.', '_')}"
-        for node in workflow.nodes:
-            if node.node_id == probe_node_id:
-                node.metadata['status'] = 'completed'
-                node.metadata['completed_at'] = timestamp
-                break
+        probe_node = workflow.find(WorkflowNodeType.PROBE, probe_name)
+        if probe_node is not None:
+            probe_node.metadata['status'] = 'completed'
+            probe_node.metadata['completed_at'] = timestamp
 
         # Get or create trace, add detector node
         trace = self._get_trace_for_probe(workflow, probe_name)
@@ -329,7 +368,7 @@ class WorkflowAnalyzer:
                 full_content=f"{probe_name} {detector_name}: {result} ok on {passed}/{total}",
                 metadata={'result': result, 'passed': passed, 'total': total}
             )
-            workflow.edges.append(edge)
+            workflow.add_edge(edge)
             trace.edges.append(edge)
 
         # Handle FAIL — create vulnerability node
@@ -348,7 +387,7 @@ class WorkflowAnalyzer:
                 },
                 timestamp=timestamp
             )
-            workflow.nodes.append(vuln_node)
+            workflow.add_node(vuln_node)
             workflow.statistics['vulnerabilities_found'] = (
                 workflow.statistics.get('vulnerabilities_found', 0) + 1
             )
@@ -363,7 +402,7 @@ class WorkflowAnalyzer:
                 full_content=f"{failed_count}/{total} tests failed",
                 metadata={'failed': failed_count, 'total': total}
             )
-            workflow.edges.append(vuln_edge)
+            workflow.add_edge(vuln_edge)
 
             if trace:
                 trace.nodes.append(vuln_node)
@@ -401,29 +440,18 @@ class WorkflowAnalyzer:
         timestamp = time.time()
         workflow = self.get_or_create_workflow(scan_id)
 
-        # Collect per-probe attempt counts
-        probe_counts: Dict[str, Dict[str, int]] = {}
-        probe_goals: Dict[str, str] = {}
+        attempts: List[dict] = []
         target_model: Optional[str] = None
 
         for entry in entries:
             etype = entry.get("entry_type")
 
-            if etype == "config":
-                target_model = entry.get("plugins.target_name")
+            if etype == "attempt":
+                # Tallied in bulk below; attempts dominate large reports
+                attempts.append(entry)
 
-            elif etype == "attempt":
-                probe = entry.get("probe_classname", "unknown")
-                if probe not in probe_counts:
-                    probe_counts[probe] = {"passed": 0, "failed": 0}
-                status = entry.get("status")
-                if status == 2:
-                    probe_counts[probe]["passed"] += 1
-                elif status == 1:
-                    probe_counts[probe]["failed"] += 1
-                goal = entry.get("goal")
-                if goal and probe not in probe_goals:
-                    probe_goals[probe] = goal
+            elif etype == "config":
+                target_model = entry.get("plugins.target_name")
 
             elif etype == "eval":
                 probe = entry.get("probe")
@@ -438,22 +466,38 @@ class WorkflowAnalyzer:
                         result, passed, total, timestamp
                     )
 
+        # Per-(probe, status) attempt counts; key order follows each probe's
+        # first attempt, so probe nodes keep report order
+        tally = Counter(
+            (attempt.get("probe_classname", "unknown"), attempt.get("status"))
+            for attempt in attempts
+        )
+        seen = self._seen_probes.get(scan_id, set())
+        missing = [probe for probe in dict.fromkeys(p for p, _ in tally) if probe not in seen]
+
         # For probes that had attempts but no eval entry, create probe nodes
-        for probe_name in probe_counts:
-            if probe_name not in self._seen_probes.get(scan_id, set()):
+        if missing:
+            probe_goals: Dict[str, str] = {}
+            for attempt in attempts:
+                probe = attempt.get("probe_classname", "unknown")
+                if probe not in probe_goals:
+                    goal = attempt.get("goal")
+                    if goal:
+                        probe_goals[probe] = goal
+
+            for probe_name in missing:
                 self._ensure_probe_node(workflow, scan_id, probe_name, timestamp)
                 # Mark completed since this is from a finished report
-                node_id = f"probe_{probe_name.replace('.', '_')}"
-                for node in workflow.nodes:
-                    if node.node_id == node_id:
-                        node.metadata['status'] = 'completed'
-                        counts = probe_counts[probe_name]
-                        node.metadata['passed'] = counts['passed']
-                        node.metadata['failed'] = counts['failed']
-                        node.metadata['total'] = counts['passed'] + counts['failed']
-                        if probe_name in probe_goals:
-                            node.description = probe_goals[probe_name]
-                        break
+                node = workflow.find(WorkflowNodeType.PROBE, probe_name)
+                if node is not None:
+                    node.metadata['status'] = 'completed'
+                    passed = tally[(probe_name, 2)]
+                    failed = tally[(probe_name, 1)]
+                    node.metadata['passed'] = passed
+                    node.metadata['failed'] = failed
+                    node.metadata['total'] = passed + failed
+                    if probe_name in probe_goals:
+                        node.description = probe_goals[probe_name]
 
         # Store target model in layout hints for the frontend
         if target_model:
@@ -464,6 +508,7 @@ class WorkflowAnalyzer:
             self.clear_workflow(scan_id)
             return None
 
+        workflow.touch()
         return workflow
 
     def get_workflow_graph(self, scan_id: str) -> Optional[WorkflowGraph]:
@@ -476,8 +521,18 @@ class WorkflowAnalyzer:
         if not workflow:
             return []
 
+        # Prompt/response content per target node, from one pass over the
+        # edges (the last matching edge wins, as before)
+        prompts: Dict[str, str] = {}
+        responses: Dict[str, str] = {}
+        for edge in workflow.edges:
+            if edge.edge_type == WorkflowEdgeType.PROMPT:
+                prompts[edge.target_id] = edge.full_content
+            elif edge.edge_type == WorkflowEdgeType.RESPONSE:
+                responses[edge.target_id] = edge.full_content
+
         events = []
-        for i, node in enumerate(sorted(workflow.nodes, key=lambda n: n.timestamp)):
+        for i, node in enumerate(workflow.nodes_by_time):
             event = WorkflowTimelineEvent(
                 event_id=f"event_{i}",
                 event_type=node.node_type.value,
@@ -489,12 +544,10 @@ class WorkflowAnalyzer:
             )
 
             # Add prompt/response if available from edges
-            for edge in workflow.edges:
-                if edge.target_id == node.node_id:
-                    if edge.edge_type == WorkflowEdgeType.PROMPT:
-                        event.prompt = edge.full_content
-                    elif edge.edge_type == WorkflowEdgeType.RESPONSE:
-                        event.response = edge.full_content
+            if node.node_id in prompts:
+                event.prompt = prompts[node.node_id]
+            if node.node_id in responses:
+                event.response = responses[node.node_id]
 
             # Add duration if available
             if 'latency_ms' in node.metadata:
@@ -510,15 +563,26 @@ class WorkflowAnalyzer:
         if not workflow:
             return ""
 
-        if format == "json":
-            return workflow.model_dump_json(indent=2)
-
-        elif format == "mermaid":
-            return self._export_mermaid(workflow)
-
-        else:
+        if format not in ("json", "mermaid"):
             raise ValueError(f"Unsupported export format: {format}")
 
+        # Dashboards poll exports of graphs that mostly have not changed
+        key = (workflow.version, len(workflow.nodes), len(workflow.edges))
+        cached = self._export_cache.get(scan_id)
+        if cached is None or cached[0] is not workflow or cached[1] != key:
+            cached = (workflow, key, {})
+            self._export_cache[scan_id] = cached
+        outputs = cached[2]
+
+        output = outputs.get(format)
+        if output is None:
+            if format == "json":
+                output = workflow.model_dump_json(indent=2)
+            else:
+                output = self._export_mermaid(workflow)
+            outputs[format] = output
+        return output
+
     def _export_mermaid(self, workflow: WorkflowGraph) -> str:
         """Export workflow as Mermaid diagram"""
         lines = ["graph TD"]
@@ -553,6 +617,7 @@ class WorkflowAnalyzer:
             del self.active_workflows[scan_id]
         self._seen_probes.pop(scan_id, None)
         self._current_probe.pop(scan_id, None)
+        self._export_cache.pop(scan_id, None)
 
 
 # Global instance
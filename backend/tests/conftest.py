@@ -0,0 +1,38 @@
+"""
+Shared fixtures for the backend test suite.
+"""
+import os
+from types import SimpleNamespace
+
+import pytest
+
+
+def _settings_for(reports_dir, garak_service_url="http://localhost:9090"):
+    """Settings object injected into GarakWrapper in place of config.settings."""
+    return SimpleNamespace(
+        garak_service_url=garak_service_url,
+        garak_reports_path=reports_dir,
+        max_concurrent_scans=5,
+    )
+
+
+def _bump_mtime(path):
+    """Advance a file's mtime by 10ms without sleeping.
+
+    Keeps mtime-invalidation tests deterministic on filesystems with
+    coarse timestamp granularity.
+    """
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10_000_000))
+
+
+@pytest.fixture(scope="session")
+def make_settings():
+    """Factory for GarakWrapper settings: make_settings(reports_dir[, garak_service_url])."""
+    return _settings_for
+
+
+@pytest.fixture(scope="session")
+def bump_mtime():
+    """Advance a report file's mtime so the cache sees it as rewritten."""
+    return _bump_mtime
@@ -9,9 +9,11 @@ Covers:
 - Shared cache between _parse_report_file, get_probe_details, get_probe_attempts
 - Garak service HTTP fallback for reports not in Minio or local filesystem
 """
+import gc
 import json
 import os
 import sys
+import threading
 import time
 import tempfile
 from pathlib import Path
@@ -79,22 +81,39 @@ def _sample_entries() -> list[dict]:
     ]
 
 
+@pytest.fixture(scope="session")
+def sample_jsonl() -> str:
+    """Serialized sample report, built once per session.
+
+    Tests that need a variant (extra entries, malformed lines) build
+    their own content explicitly.
+    """
+    return _make_report_jsonl(_sample_entries())
+
+
 @pytest.fixture
-def reports_dir(tmp_path):
+def reports_dir(tmp_path, sample_jsonl):
     """Create a temporary reports directory with a sample JSONL file."""
     report_file = tmp_path / f"garak.{SCAN_ID}.report.jsonl"
-    report_file.write_text(_make_report_jsonl(_sample_entries()))
+    report_file.write_text(sample_jsonl)
     return tmp_path
 
 
 @pytest.fixture
-def wrapper(reports_dir):
+def wrapper(reports_dir, make_settings):
     """Create a GarakWrapper with the temp reports dir and a short TTL."""
-    with patch("services.garak_wrapper.settings") as mock_settings:
-        mock_settings.garak_service_url = "http://localhost:9090"
-        mock_settings.garak_reports_path = reports_dir
-        w = GarakWrapper(cache_ttl=2)  # 2-second TTL for tests
-    return w
+    return GarakWrapper(cache_ttl=2, settings=make_settings(reports_dir))  # 2-second TTL for tests
+
+
+@pytest.fixture
+def fake_clock(wrapper):
+    """Swap the wrapper's clock for one the test advances by hand.
+
+    Returns a one-element list holding the current time in seconds.
+    """
+    now = [1000.0]
+    wrapper._clock = lambda: now[0]
+    return now
 
 
 # ---------------------------------------------------------------------------
@@ -115,11 +134,33 @@ class TestGetReportEntries:
         assert entries is None
 
     def test_cache_hit_returns_same_object(self, wrapper):
-        """Second call should return the exact same list object (cache hit)."""
+        """Second call should return the exact same entries object (cache hit)."""
         first = wrapper._get_report_entries(SCAN_ID)
         second = wrapper._get_report_entries(SCAN_ID)
         assert first is second  # same object reference = cache hit
 
+    def test_warm_local_hit_skips_load_path(self, wrapper):
+        """An unchanged local report is served after a stat, with no in-flight marker."""
+        first = wrapper._get_report_entries(SCAN_ID)
+        with patch.object(wrapper, "_load_report_entries") as mock_load, \
+                patch.object(wrapper, "_read_entries_from_object_store") as mock_store:
+            second = wrapper._get_report_entries(SCAN_ID)
+
+        assert first is second
+        mock_load.assert_not_called()
+        mock_store.assert_not_called()
+        assert SCAN_ID not in wrapper._inflight
+
+    def test_cached_entries_are_read_only(self, wrapper):
+        """Consumers share the cached entries, so mutation must fail loudly."""
+        entries = wrapper._get_report_entries(SCAN_ID)
+        assert isinstance(entries, tuple)
+        with pytest.raises(TypeError):
+            entries[1]["status"] = 1
+        with pytest.raises(TypeError):
+            entries[0] = {}
+        assert wrapper._get_report_entries(SCAN_ID)[1]["status"] == 2
+
     def test_cache_populates_internal_dict(self, wrapper):
         assert SCAN_ID not in wrapper._report_cache
         wrapper._get_report_entries(SCAN_ID)
@@ -129,6 +170,41 @@ class TestGetReportEntries:
         assert "cached_at" in wrapper._report_cache[SCAN_ID]
 
 
+# ---------------------------------------------------------------------------
+# Concurrent access
+# ---------------------------------------------------------------------------
+
+class TestConcurrentAccess:
+    """Concurrent cache misses for the same scan should be coalesced."""
+
+    def test_concurrent_misses_parse_once(self, wrapper):
+        real_parse = wrapper._parse_local_report
+
+        def slow_parse(data):
+            # Hold the parse open long enough for the other threads to queue up
+            time.sleep(0.05)
+            return real_parse(data)
+
+        barrier = threading.Barrier(8)
+        results = []
+
+        def worker():
+            barrier.wait()
+            results.append(wrapper._get_report_entries(SCAN_ID))
+
+        with patch.object(wrapper, "_parse_local_report", MagicMock(wraps=slow_parse)) as mock_parse:
+            threads = [threading.Thread(target=worker) for _ in range(8)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+        mock_parse.assert_called_once()
+        assert len(results) == 8
+        assert all(r is results[0] for r in results)
+        assert wrapper._inflight == {}
+
+
 # ---------------------------------------------------------------------------
 # TTL expiry
 # ---------------------------------------------------------------------------
@@ -136,27 +212,48 @@ class TestGetReportEntries:
 class TestCacheTTL:
     """Test TTL-based cache invalidation."""
 
-    def test_cache_expires_after_ttl(self, wrapper):
-        """After TTL, cache should be refreshed."""
+    def test_cache_expires_after_ttl(self, wrapper, fake_clock):
+        """After TTL, the file is re-read; unchanged bytes keep the parsed entries."""
         first = wrapper._get_report_entries(SCAN_ID)
         assert first is not None
 
-        # Artificially expire the cache
-        wrapper._report_cache[SCAN_ID]["cached_at"] = time.monotonic() - 10
+        # Step past the 2-second TTL
+        fake_clock[0] += 2.5
+
+        with patch.object(wrapper, "_parse_local_report") as mock_parse:
+            second = wrapper._get_report_entries(SCAN_ID)
+
+        mock_parse.assert_not_called()
+        assert first is second
+        # Revalidated entry starts a new TTL window
+        assert wrapper._report_cache[SCAN_ID]["cached_at"] == fake_clock[0]
+
+    def test_changed_content_reparsed_after_ttl(self, wrapper, reports_dir, fake_clock):
+        """A same-size, same-mtime rewrite is only caught once the TTL runs out."""
+        first = wrapper._get_report_entries(SCAN_ID)
+        report_file = reports_dir / f"garak.{SCAN_ID}.report.jsonl"
+        st = report_file.stat()
+        report_file.write_bytes(report_file.read_bytes().replace(b'"status": 2', b'"status": 1', 1))
+        os.utime(report_file, ns=(st.st_atime_ns, st.st_mtime_ns))
 
+        assert wrapper._get_report_entries(SCAN_ID) is first
+        fake_clock[0] += 2.5
         second = wrapper._get_report_entries(SCAN_ID)
-        assert second is not None
-        # New object = cache was refreshed
-        assert first is not second
-        assert len(second) == len(first)
+        assert second is not first
+        assert second[1]["status"] == 1
 
-    def test_cache_valid_within_ttl(self, wrapper):
+    def test_cache_valid_within_ttl(self, wrapper, fake_clock):
         """Within TTL, cache should return same object."""
         first = wrapper._get_report_entries(SCAN_ID)
-        # Don't manipulate cached_at, just call again immediately
+        fake_clock[0] += 1.5
         second = wrapper._get_report_entries(SCAN_ID)
         assert first is second
 
+    def test_clock_is_injectable(self, reports_dir, make_settings):
+        w = GarakWrapper(cache_ttl=2, clock=lambda: 42.0, settings=make_settings(reports_dir))
+        w._get_report_entries(SCAN_ID)
+        assert w._report_cache[SCAN_ID]["cached_at"] == 42.0
+
 
 # ---------------------------------------------------------------------------
 # mtime-based invalidation
@@ -165,7 +262,7 @@ class TestCacheTTL:
 class TestCacheMtimeInvalidation:
     """Test that file changes invalidate the cache."""
 
-    def test_mtime_change_refreshes_cache(self, wrapper, reports_dir):
+    def test_mtime_change_refreshes_cache(self, wrapper, reports_dir, bump_mtime):
         """If the file is rewritten, cache should be invalidated."""
         first = wrapper._get_report_entries(SCAN_ID)
         assert first is not None
@@ -179,15 +276,112 @@ class TestCacheMtimeInvalidation:
             "status": 1,
             "goal": "Inject encoded content",
         })
-        # Ensure mtime changes by writing with a slight delay
-        time.sleep(0.05)
         report_file.write_text(_make_report_jsonl(entries))
+        bump_mtime(report_file)
 
         second = wrapper._get_report_entries(SCAN_ID)
         assert second is not None
         assert len(second) == 7  # one more entry
         assert first is not second
 
+    def test_identical_rewrite_skips_reparse(self, wrapper, reports_dir, bump_mtime):
+        """A new mtime over byte-identical content reuses the parsed entries."""
+        first = wrapper._get_report_entries(SCAN_ID)
+        report_file = reports_dir / f"garak.{SCAN_ID}.report.jsonl"
+        report_file.write_bytes(report_file.read_bytes())
+        bump_mtime(report_file)
+
+        with patch.object(wrapper, "_parse_local_report") as mock_parse:
+            second = wrapper._get_report_entries(SCAN_ID)
+
+        mock_parse.assert_not_called()
+        assert first is second
+        assert wrapper._report_cache[SCAN_ID]["mtime"] == report_file.stat().st_mtime_ns
+
+    def test_same_size_different_content_reparses(self, wrapper, reports_dir, bump_mtime):
+        """Equal size is not enough; changed bytes must trigger a reparse."""
+        first = wrapper._get_report_entries(SCAN_ID)
+        report_file = reports_dir / f"garak.{SCAN_ID}.report.jsonl"
+        original = report_file.read_bytes()
+        # Flip one attempt from passed (2) to failed (1) without changing size
+        rewritten = original.replace(b'"status": 2', b'"status": 1', 1)
+        assert rewritten != original and len(rewritten) == len(original)
+        report_file.write_bytes(rewritten)
+        bump_mtime(report_file)
+
+        second = wrapper._get_report_entries(SCAN_ID)
+        assert second is not first
+        assert second[1]["status"] == 1
+
+    def test_size_change_skips_digest(self, wrapper, reports_dir, bump_mtime):
+        """A report that grew is reparsed without hashing its bytes."""
+        from services import garak_wrapper as gw
+
+        wrapper._get_report_entries(SCAN_ID)
+        report_file = reports_dir / f"garak.{SCAN_ID}.report.jsonl"
+        with report_file.open("a") as f:
+            f.write("\n" + json.dumps({"entry_type": "attempt", "status": 2}))
+        bump_mtime(report_file)
+
+        with patch.object(gw, "_content_digest") as mock_digest:
+            second = wrapper._get_report_entries(SCAN_ID)
+
+        mock_digest.assert_not_called()
+        assert len(second) == 7
+        assert wrapper._report_cache[SCAN_ID]["digest"] is None
+
+
+# ---------------------------------------------------------------------------
+# Negative cache (missing scan_ids)
+# ---------------------------------------------------------------------------
+
+class TestNegativeCache:
+    """Repeated lookups for a missing scan should not re-walk every source."""
+
+    def test_missing_scan_is_remembered(self, wrapper):
+        with patch.object(wrapper, "_load_report_entries", return_value=None) as mock_load:
+            assert wrapper._get_report_entries("nonexistent-scan") is None
+            assert wrapper._get_report_entries("nonexistent-scan") is None
+        mock_load.assert_called_once()
+        assert "nonexistent-scan" in wrapper._negative_cache
+
+    def test_negative_entry_expires_after_ttl(self, wrapper, fake_clock):
+        wrapper._get_report_entries("nonexistent-scan")
+        fake_clock[0] += 10
+
+        with patch.object(wrapper, "_load_report_entries", return_value=None) as mock_load:
+            wrapper._get_report_entries("nonexistent-scan")
+        mock_load.assert_called_once()
+
+    def test_invalidate_cache_forgets_missing_scan(self, wrapper, reports_dir, sample_jsonl):
+        scan_id = "late-scan"
+        assert wrapper._get_report_entries(scan_id) is None
+
+        report_file = reports_dir / f"garak.{scan_id}.report.jsonl"
+        report_file.write_text(sample_jsonl)
+        assert wrapper._get_report_entries(scan_id) is None  # still negatively cached
+
+        wrapper.invalidate_cache(scan_id)
+        entries = wrapper._get_report_entries(scan_id)
+        assert entries is not None
+        assert len(entries) == 6
+
+    def test_complete_event_forgets_missing_scan(self, wrapper):
+        scan_id = "running-scan"
+        wrapper.active_scans[scan_id] = {"scan_id": scan_id, "status": "running"}
+        wrapper._get_report_entries(scan_id)
+        assert scan_id in wrapper._negative_cache
+
+        wrapper._update_scan_from_event(scan_id, {"event_type": "complete"})
+        assert scan_id not in wrapper._negative_cache
+
+    def test_negative_cache_is_bounded(self, wrapper):
+        with patch("services.garak_wrapper.NEGATIVE_CACHE_MAX", 3), \
+             patch.object(wrapper, "_load_report_entries", return_value=None):
+            for i in range(5):
+                wrapper._get_report_entries(f"missing-{i}")
+        assert list(wrapper._negative_cache) == ["missing-2", "missing-3", "missing-4"]
+
 
 # ---------------------------------------------------------------------------
 # Manual invalidation
@@ -207,12 +401,12 @@ class TestManualInvalidation:
         """Invalidating a scan that's not cached should not raise."""
         wrapper.invalidate_cache("nonexistent")  # no error
 
-    def test_clear_cache_removes_all(self, wrapper, reports_dir):
+    def test_clear_cache_removes_all(self, wrapper, reports_dir, sample_jsonl):
         """clear_cache should empty the entire cache."""
         # Create a second scan
         scan_id2 = "test-scan-002"
         report2 = reports_dir / f"garak.{scan_id2}.report.jsonl"
-        report2.write_text(_make_report_jsonl(_sample_entries()))
+        report2.write_text(sample_jsonl)
 
         wrapper._get_report_entries(SCAN_ID)
         wrapper._get_report_entries(scan_id2)
@@ -344,6 +538,56 @@ class TestCachedResultsCorrectness:
         assert result["attempts"][0]["status"] == "failed"
 
 
+# ---------------------------------------------------------------------------
+# Per-probe breakdown cache (get_probe_details)
+# ---------------------------------------------------------------------------
+
+class TestProbeDetailsCache:
+    """The sorted per-probe rows are reused while the entries stay cached."""
+
+    def test_repeat_calls_build_once(self, wrapper):
+        with patch.object(
+            wrapper, "_build_probe_details", wraps=wrapper._build_probe_details
+        ) as mock_build:
+            first = wrapper.get_probe_details(SCAN_ID)
+            second = wrapper.get_probe_details(SCAN_ID)
+            filtered = wrapper.get_probe_details(SCAN_ID, probe_filter="encoding")
+
+        mock_build.assert_called_once()
+        assert first == second
+        assert [p["probe_classname"] for p in filtered["probes"]] == ["encoding.InjectBase64"]
+
+    def test_filter_and_pagination_over_cached_rows(self, wrapper):
+        wrapper.get_probe_details(SCAN_ID)
+        page = wrapper.get_probe_details(SCAN_ID, page=2, page_size=1)
+        assert page["total_probes"] == 2
+        # Worst pass rate first: dan (50%) then encoding (100%)
+        assert page["probes"][0]["probe_classname"] == "encoding.InjectBase64"
+
+    def test_returned_rows_do_not_alias_cache(self, wrapper):
+        """A caller editing a returned row must not change later responses."""
+        first = wrapper.get_probe_details(SCAN_ID)
+        row = first["probes"][0]
+        row["passed"] = -1
+        row["security"]["category"] = "tampered"
+
+        second = wrapper.get_probe_details(SCAN_ID)
+        assert second["probes"][0]["passed"] != -1
+        assert second["probes"][0]["security"]["category"] != "tampered"
+
+    def test_rows_rebuilt_when_report_changes(self, wrapper, reports_dir, bump_mtime):
+        first = wrapper.get_probe_details(SCAN_ID)
+        entries = _sample_entries()
+        entries.append({"entry_type": "attempt", "probe_classname": "x.Y", "status": 1})
+        report_file = reports_dir / f"garak.{SCAN_ID}.report.jsonl"
+        report_file.write_text(_make_report_jsonl(entries))
+        bump_mtime(report_file)
+
+        second = wrapper.get_probe_details(SCAN_ID)
+        assert first["total_probes"] == 2
+        assert second["total_probes"] == 3
+
+
 # ---------------------------------------------------------------------------
 # Edge cases
 # ---------------------------------------------------------------------------
@@ -394,12 +638,9 @@ class TestCacheEdgeCases:
         """Verify the default TTL constant."""
         assert REPORT_CACHE_TTL == 300
 
-    def test_custom_ttl_in_constructor(self, reports_dir):
+    def test_custom_ttl_in_constructor(self, reports_dir, make_settings):
         """Verify custom TTL can be passed."""
-        with patch("services.garak_wrapper.settings") as mock_settings:
-            mock_settings.garak_service_url = "http://localhost:9090"
-            mock_settings.garak_reports_path = reports_dir
-            w = GarakWrapper(cache_ttl=60)
+        w = GarakWrapper(cache_ttl=60, settings=make_settings(reports_dir))
         assert w._cache_ttl == 60
 
 
@@ -417,15 +658,15 @@ class TestParseReportFile:
         assert result["passed"] == 2
         assert result["failed"] == 1
 
-    def test_parse_detects_file_changes(self, wrapper, reports_dir):
+    def test_parse_detects_file_changes(self, wrapper, reports_dir, bump_mtime):
         report_file = reports_dir / f"garak.{SCAN_ID}.report.jsonl"
         first = wrapper._parse_report_file(report_file, SCAN_ID)
 
         # Rewrite file with extra attempt
-        time.sleep(0.05)
         entries = _sample_entries()
         entries.append({"entry_type": "attempt", "probe_classname": "x.Y", "status": 1})
         report_file.write_text(_make_report_jsonl(entries))
+        bump_mtime(report_file)
 
         second = wrapper._parse_report_file(report_file, SCAN_ID)
         assert second["failed"] == 2  # was 1, now 2
@@ -472,15 +713,15 @@ class TestResultsCache:
         # Clean up
         del wrapper.active_scans[SCAN_ID]
 
-    def test_mtime_change_refreshes_results(self, wrapper, reports_dir):
+    def test_mtime_change_refreshes_results(self, wrapper, reports_dir, bump_mtime):
         first = wrapper.get_scan_results(SCAN_ID)
         assert first is not None
 
-        time.sleep(0.05)
         entries = _sample_entries()
         entries.append({"entry_type": "attempt", "probe_classname": "x.Y", "status": 1})
         report_file = reports_dir / f"garak.{SCAN_ID}.report.jsonl"
         report_file.write_text(_make_report_jsonl(entries))
+        bump_mtime(report_file)
 
         second = wrapper.get_scan_results(SCAN_ID)
         assert second is not first
@@ -503,17 +744,20 @@ class TestResultsCache:
         assert result is None
 
     def test_both_cache_layers_cleared_together(self, wrapper, reports_dir):
-        """invalidate_cache should clear both remaining cache layers."""
+        """invalidate_cache should clear every remaining cache layer."""
         wrapper._get_report_entries(SCAN_ID)
         wrapper.get_scan_results(SCAN_ID)
+        wrapper.get_probe_details(SCAN_ID)
 
         assert SCAN_ID in wrapper._report_cache
         assert SCAN_ID in wrapper._results_cache
+        assert SCAN_ID in wrapper._probe_details_cache
 
         wrapper.invalidate_cache(SCAN_ID)
 
         assert SCAN_ID not in wrapper._report_cache
         assert SCAN_ID not in wrapper._results_cache
+        assert SCAN_ID not in wrapper._probe_details_cache
 
 
 # ---------------------------------------------------------------------------
@@ -523,17 +767,14 @@ class TestResultsCache:
 class TestGarakServiceFallback:
     """Test the garak service HTTP fallback for reports not in Minio/local."""
 
-    def test_fallback_fetches_from_garak_service(self, reports_dir):
+    def test_fallback_fetches_from_garak_service(self, reports_dir, sample_jsonl, make_settings):
         """When Minio and local miss, fetch from garak service via HTTP."""
-        with patch("services.garak_wrapper.settings") as mock_settings:
-            mock_settings.garak_service_url = "http://garak:9090"
-            mock_settings.garak_reports_path = reports_dir
-            w = GarakWrapper(cache_ttl=2)
+        w = GarakWrapper(cache_ttl=2, settings=make_settings(reports_dir, "http://garak:9090"))
 
         scan_id = "fallback-scan"
         garak_uuid = "aaaa-bbbb-cccc"
         garak_path = f"/data/garak_reports/garak.{garak_uuid}.report.jsonl"
-        content = _make_report_jsonl(_sample_entries())
+        content = sample_jsonl
 
         # Mock the DB lookup to return the garak path
         with patch.object(w, "_get_report_path_from_db", return_value=garak_path), \
@@ -550,15 +791,12 @@ class TestGarakServiceFallback:
         assert entries is not None
         assert len(entries) == 6
 
-    def test_fallback_caches_as_immutable(self, reports_dir):
+    def test_fallback_caches_as_immutable(self, reports_dir, sample_jsonl, make_settings):
         """Fetched entries should be cached as immutable."""
-        with patch("services.garak_wrapper.settings") as mock_settings:
-            mock_settings.garak_service_url = "http://garak:9090"
-            mock_settings.garak_reports_path = reports_dir
-            w = GarakWrapper(cache_ttl=2)
+        w = GarakWrapper(cache_ttl=2, settings=make_settings(reports_dir, "http://garak:9090"))
 
         scan_id = "immutable-fallback"
-        content = _make_report_jsonl(_sample_entries())
+        content = sample_jsonl
 
         with patch.object(w, "_get_report_path_from_db", return_value="/data/garak_reports/test.jsonl"), \
              patch("httpx.Client") as mock_httpx, \
@@ -574,24 +812,18 @@ class TestGarakServiceFallback:
         assert scan_id in w._report_cache
         assert w._report_cache[scan_id]["immutable"] is True
 
-    def test_fallback_returns_none_when_no_db_path(self, reports_dir):
+    def test_fallback_returns_none_when_no_db_path(self, reports_dir, make_settings):
         """If DB has no report_path, fallback returns None."""
-        with patch("services.garak_wrapper.settings") as mock_settings:
-            mock_settings.garak_service_url = "http://garak:9090"
-            mock_settings.garak_reports_path = reports_dir
-            w = GarakWrapper(cache_ttl=2)
+        w = GarakWrapper(cache_ttl=2, settings=make_settings(reports_dir, "http://garak:9090"))
 
         with patch.object(w, "_get_report_path_from_db", return_value=None):
             entries = w._get_report_entries("no-path-scan")
 
         assert entries is None
 
-    def test_fallback_returns_none_on_http_error(self, reports_dir):
+    def test_fallback_returns_none_on_http_error(self, reports_dir, make_settings):
         """If garak service returns non-200, fallback returns None."""
-        with patch("services.garak_wrapper.settings") as mock_settings:
-            mock_settings.garak_service_url = "http://garak:9090"
-            mock_settings.garak_reports_path = reports_dir
-            w = GarakWrapper(cache_ttl=2)
+        w = GarakWrapper(cache_ttl=2, settings=make_settings(reports_dir, "http://garak:9090"))
 
         with patch.object(w, "_get_report_path_from_db", return_value="/data/report.jsonl"), \
              patch("httpx.Client") as mock_httpx:
@@ -604,15 +836,12 @@ class TestGarakServiceFallback:
 
         assert entries is None
 
-    def test_fallback_uploads_to_object_store(self, reports_dir):
+    def test_fallback_uploads_to_object_store(self, reports_dir, sample_jsonl, make_settings):
         """Fetched reports should be uploaded to object store for caching."""
-        with patch("services.garak_wrapper.settings") as mock_settings:
-            mock_settings.garak_service_url = "http://garak:9090"
-            mock_settings.garak_reports_path = reports_dir
-            w = GarakWrapper(cache_ttl=2)
+        w = GarakWrapper(cache_ttl=2, settings=make_settings(reports_dir, "http://garak:9090"))
 
         scan_id = "upload-test"
-        content = _make_report_jsonl(_sample_entries())
+        content = sample_jsonl
 
         with patch.object(w, "_get_report_path_from_db", return_value="/data/report.jsonl"), \
              patch("httpx.Client") as mock_httpx, \
@@ -634,3 +863,97 @@ class TestGarakServiceFallback:
 
         assert entries is not None
         mock_fetch.assert_not_called()
+
+
+# ---------------------------------------------------------------------------
+# Bulk parse
+# ---------------------------------------------------------------------------
+
+class TestBulkParse:
+    """The JSONL parser pauses the cyclic GC only while it runs."""
+
+    def test_gc_disabled_during_parse_and_restored(self, sample_jsonl):
+        from services import garak_wrapper as gw
+
+        seen = []
+        real_loads = gw._safe_loads
+
+        def spy_loads(line):
+            seen.append(gc.isenabled())
+            return real_loads(line)
+
+        assert gc.isenabled()
+        with patch.object(gw, "_safe_loads", spy_loads):
+            entries = gw._parse_jsonl(sample_jsonl.encode("utf-8"))
+
+        assert len(entries) == 6
+        assert seen and not any(seen)
+        assert gc.isenabled()
+
+    def test_gc_disabled_while_freezing(self, wrapper):
+        from services import garak_wrapper as gw
+
+        seen = []
+        real_proxy = gw.MappingProxyType
+
+        def spy_proxy(entry):
+            seen.append(gc.isenabled())
+            return real_proxy(entry)
+
+        with patch.object(gw, "MappingProxyType", spy_proxy):
+            entries = wrapper._get_report_entries(SCAN_ID)
+
+        assert len(entries) == 6
+        assert seen and not any(seen)
+        assert gc.isenabled()
+
+    def test_gc_left_disabled_if_caller_disabled_it(self):
+        from services import garak_wrapper as gw
+
+        gc.disable()
+        try:
+            gw._parse_jsonl(b'{"entry_type": "config"}')
+            assert not gc.isenabled()
+        finally:
+            gc.enable()
+
+    def test_overlapping_pauses_resume_once(self):
+        """The collector stays off until the last overlapping parse finishes."""
+        from services import garak_wrapper as gw
+
+        assert gc.isenabled()
+        with gw._gc_paused():
+            gw._parse_jsonl(b'{"entry_type": "config"}')
+            assert not gc.isenabled()
+        assert gc.isenabled()
+
+    def test_overlapping_pauses_keep_caller_disabled_gc(self):
+        from services import garak_wrapper as gw
+
+        gc.disable()
+        try:
+            with gw._gc_paused():
+                gw._parse_jsonl(b'{"entry_type": "config"}')
+            assert not gc.isenabled()
+        finally:
+            gc.enable()
+
+    def test_non_standard_float_rows_kept(self):
+        """Rows orjson rejects (NaN from json.dumps) fall back to the stdlib decoder."""
+        from services import garak_wrapper as gw
+
+        data = b'{"entry_type": "eval", "score": NaN}\nnot json\n{"entry_type": "digest"}'
+        entries = gw._parse_jsonl(data)
+        assert [e["entry_type"] for e in entries] == ["eval", "digest"]
+
+    def test_non_object_rows_skipped(self, wrapper, reports_dir):
+        """Valid JSON that is not an object (arrays, scalars) is skipped, not cached."""
+        report_file = reports_dir / f"garak.{SCAN_ID}.report.jsonl"
+        report_file.write_text(
+            _make_report_jsonl(_sample_entries()) + '\n[1, 2]\n"text"\n42\nnull\n'
+        )
+
+        entries = wrapper._get_report_entries(SCAN_ID)
+        assert entries is not None
+        assert all(isinstance(e["entry_type"], str) for e in entries)
+        assert wrapper.get_scan_results(SCAN_ID) is not None
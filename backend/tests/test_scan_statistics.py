@@ -12,13 +12,13 @@ Covers:
 - Target breakdown
 - Days parameter for trend window
 """
-import json
 import os
 import sys
 from datetime import datetime, timedelta
 from pathlib import Path
 from unittest.mock import patch
 
+import orjson
 import pytest
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
@@ -30,8 +30,8 @@ from services.garak_wrapper import GarakWrapper
 # Helpers
 # ---------------------------------------------------------------------------
 
-def _make_report_jsonl(entries: list[dict]) -> str:
-    return "\n".join(json.dumps(e) for e in entries)
+def _make_report_jsonl(entries: list[dict]) -> bytes:
+    return b"\n".join(orjson.dumps(e) for e in entries)
 
 
 def _make_scan_entries(
@@ -64,23 +64,43 @@ def _attempt(probe: str, status: int) -> dict:
 # Fixtures
 # ---------------------------------------------------------------------------
 
-@pytest.fixture
-def reports_dir(tmp_path):
-    return tmp_path
+# One reports dir and one wrapper per module (and per xdist worker); the
+# autouse fixture below resets both between tests.
 
+@pytest.fixture(scope="module")
+def reports_dir(tmp_path_factory):
+    return tmp_path_factory.mktemp("reports")
 
-@pytest.fixture
-def wrapper(reports_dir):
-    with patch("services.garak_wrapper.settings") as mock_settings:
-        mock_settings.garak_service_url = "http://localhost:9090"
-        mock_settings.garak_reports_path = reports_dir
-        w = GarakWrapper(cache_ttl=300)
-    return w
+
+@pytest.fixture(scope="module")
+def wrapper(reports_dir, make_settings):
+    return GarakWrapper(cache_ttl=300, settings=make_settings(reports_dir))
+
+
+@pytest.fixture(scope="session")
+def base_scan_bytes():
+    """The default config entry, serialized once for every default-config scan."""
+    return orjson.dumps(_make_scan_entries()[0]) + b"\n"
+
+
+@pytest.fixture(autouse=True)
+def _clean_state(wrapper, reports_dir):
+    yield
+    for report_file in reports_dir.iterdir():
+        report_file.unlink()
+    wrapper.clear_cache()
+    wrapper.active_scans.clear()
 
 
 def _write_scan(reports_dir: Path, scan_id: str, entries: list[dict]):
     report_file = reports_dir / f"garak.{scan_id}.report.jsonl"
-    report_file.write_text(_make_report_jsonl(entries))
+    report_file.write_bytes(_make_report_jsonl(entries))
+
+
+def _write_attempts(reports_dir: Path, scan_id: str, base: bytes, attempts: list[dict]):
+    """Write a default-config scan: prebuilt config line plus serialized attempts."""
+    report_file = reports_dir / f"garak.{scan_id}.report.jsonl"
+    report_file.write_bytes(base + _make_report_jsonl(attempts))
 
 
 # ---------------------------------------------------------------------------
@@ -116,14 +136,12 @@ class TestEmptyState:
 
 class TestSingleScan:
 
-    def test_counts_single_completed_scan(self, wrapper, reports_dir):
-        _write_scan(reports_dir, "scan-1", _make_scan_entries(
-            attempts=[
-                _attempt("dan.DanJailbreak", 2),  # passed
-                _attempt("dan.DanJailbreak", 1),  # failed
-                _attempt("encoding.Base64", 2),    # passed
-            ]
-        ))
+    def test_counts_single_completed_scan(self, wrapper, reports_dir, base_scan_bytes):
+        _write_attempts(reports_dir, "scan-1", base_scan_bytes, [
+            _attempt("dan.DanJailbreak", 2),  # passed
+            _attempt("dan.DanJailbreak", 1),  # failed
+            _attempt("encoding.Base64", 2),    # passed
+        ])
         stats = wrapper.get_scan_statistics()
         assert stats["total_scans"] == 1
         assert stats["completed_scans"] == 1
@@ -131,15 +149,13 @@ class TestSingleScan:
         assert stats["total_passed"] == 2
         assert stats["total_failed"] == 1
 
-    def test_pass_rate_calculation(self, wrapper, reports_dir):
-        _write_scan(reports_dir, "scan-1", _make_scan_entries(
-            attempts=[
-                _attempt("dan.DanJailbreak", 2),
-                _attempt("dan.DanJailbreak", 1),
-                _attempt("dan.DanJailbreak", 2),
-                _attempt("dan.DanJailbreak", 2),
-            ]
-        ))
+    def test_pass_rate_calculation(self, wrapper, reports_dir, base_scan_bytes):
+        _write_attempts(reports_dir, "scan-1", base_scan_bytes, [
+            _attempt("dan.DanJailbreak", 2),
+            _attempt("dan.DanJailbreak", 1),
+            _attempt("dan.DanJailbreak", 2),
+            _attempt("dan.DanJailbreak", 2),
+        ])
         stats = wrapper.get_scan_statistics()
         assert stats["overall_pass_rate"] == 75.0
         assert stats["avg_pass_rate"] == 75.0
@@ -166,13 +182,11 @@ class TestSingleScan:
 
 class TestMultipleScans:
 
-    def test_aggregates_across_scans(self, wrapper, reports_dir):
-        _write_scan(reports_dir, "scan-1", _make_scan_entries(
-            attempts=[
-                _attempt("dan.DanJailbreak", 2),
-                _attempt("dan.DanJailbreak", 1),
-            ]
-        ))
+    def test_aggregates_across_scans(self, wrapper, reports_dir, base_scan_bytes):
+        _write_attempts(reports_dir, "scan-1", base_scan_bytes, [
+            _attempt("dan.DanJailbreak", 2),
+            _attempt("dan.DanJailbreak", 1),
+        ])
         _write_scan(reports_dir, "scan-2", _make_scan_entries(
             started_at="2026-02-11T12:00:00",
             attempts=[
@@ -189,11 +203,11 @@ class TestMultipleScans:
         assert stats["total_passed"] == 4
         assert stats["total_failed"] == 2
 
-    def test_pass_rate_min_max(self, wrapper, reports_dir):
+    def test_pass_rate_min_max(self, wrapper, reports_dir, base_scan_bytes):
         # Scan 1: 50% pass rate (1 pass, 1 fail)
-        _write_scan(reports_dir, "scan-1", _make_scan_entries(
-            attempts=[_attempt("dan.X", 2), _attempt("dan.X", 1)]
-        ))
+        _write_attempts(reports_dir, "scan-1", base_scan_bytes, [
+            _attempt("dan.X", 2), _attempt("dan.X", 1)
+        ])
         # Scan 2: 100% pass rate (2 pass, 0 fail)
         _write_scan(reports_dir, "scan-2", _make_scan_entries(
             started_at="2026-02-11T12:00:00",
@@ -225,6 +239,24 @@ class TestMultipleScans:
         ollama = stats["target_breakdown"][0]
         assert ollama["target_name"] == "llama3.2:3b"
         assert ollama["scan_count"] == 2
+        assert ollama["avg_pass_rate"] == 50.0
+        assert ollama["last_scanned"] == "2026-02-11T13:00:00"
+        assert set(ollama) == {
+            "target_type", "target_name", "scan_count", "last_scanned", "avg_pass_rate",
+        }
+
+    def test_target_names_containing_separator_not_merged(self, wrapper, reports_dir):
+        _write_scan(reports_dir, "scan-1", _make_scan_entries(
+            target_type="rest::v1", target_name="model",
+            attempts=[_attempt("dan.X", 2)]
+        ))
+        _write_scan(reports_dir, "scan-2", _make_scan_entries(
+            target_type="rest", target_name="v1::model",
+            attempts=[_attempt("dan.X", 1)]
+        ))
+        stats = wrapper.get_scan_statistics()
+        targets = {(t["target_type"], t["target_name"]) for t in stats["target_breakdown"]}
+        assert targets == {("rest::v1", "model"), ("rest", "v1::model")}
 
 
 # ---------------------------------------------------------------------------
@@ -233,7 +265,7 @@ class TestMultipleScans:
 
 class TestStatusCounting:
 
-    def test_counts_active_scans(self, wrapper, reports_dir):
+    def test_counts_active_scans(self, wrapper, reports_dir, base_scan_bytes):
         # Add a running scan
         wrapper.active_scans["running-1"] = {
             "scan_id": "running-1",
@@ -244,9 +276,7 @@ class TestStatusCounting:
             "target_type": "ollama", "target_name": "llama3.2:3b",
         }
         # Add a completed scan on disk
-        _write_scan(reports_dir, "scan-1", _make_scan_entries(
-            attempts=[_attempt("dan.X", 2)]
-        ))
+        _write_attempts(reports_dir, "scan-1", base_scan_bytes, [_attempt("dan.X", 2)])
         stats = wrapper.get_scan_statistics()
         assert stats["total_scans"] == 2
         assert stats["completed_scans"] == 1
@@ -255,6 +285,30 @@ class TestStatusCounting:
         # Cleanup
         del wrapper.active_scans["running-1"]
 
+    def test_active_scan_snapshots_hide_process_handle(self, wrapper):
+        scan_info = {"scan_id": "running-1", "status": "running", "process": object()}
+        wrapper.active_scans["running-1"] = scan_info
+
+        listed = wrapper.get_all_scans()
+        status = wrapper.get_scan_status("running-1")
+
+        assert listed == [{"scan_id": "running-1", "status": "running"}]
+        assert status == {"scan_id": "running-1", "status": "running"}
+        assert listed[0] is not scan_info and status is not scan_info
+        assert "process" in scan_info
+
+    def test_counts_each_status_case_insensitively(self, wrapper):
+        for i, status in enumerate(["FAILED", "cancelled", "pending", "Running", "failed"]):
+            wrapper.active_scans[f"active-{i}"] = {
+                "scan_id": f"active-{i}", "status": status, "passed": 0, "failed": 0,
+            }
+        stats = wrapper.get_scan_statistics()
+        assert stats["total_scans"] == 5
+        assert stats["completed_scans"] == 0
+        assert stats["failed_scans"] == 2
+        assert stats["cancelled_scans"] == 1
+        assert stats["running_scans"] == 2
+
 
 # ---------------------------------------------------------------------------
 # Daily trends
@@ -287,6 +341,33 @@ class TestDailyTrends:
         assert point["total_failed"] == 1
         assert point["avg_pass_rate"] == 50.0
 
+    def test_scans_outside_window_or_undated_not_bucketed(self, wrapper, reports_dir):
+        today = datetime.now()
+        old = (today - timedelta(days=10)).strftime("%Y-%m-%d")
+        _write_scan(reports_dir, "scan-old", _make_scan_entries(
+            started_at=f"{old}T12:00:00", attempts=[_attempt("dan.X", 1)]
+        ))
+        _write_scan(reports_dir, "scan-new", _make_scan_entries(
+            started_at=f"{today:%Y-%m-%d}T09:30:00", attempts=[_attempt("dan.X", 2)]
+        ))
+        _write_scan(reports_dir, "scan-bad", _make_scan_entries(
+            started_at="not-a-date", attempts=[_attempt("dan.X", 2)]
+        ))
+        stats = wrapper.get_scan_statistics(days=7)
+        assert stats["total_scans"] == 3
+        assert sum(p["scan_count"] for p in stats["daily_trends"]) == 1
+        assert stats["daily_trends"][-1]["scan_count"] == 1
+
+    def test_day_bucket_ignores_time_and_offset(self, wrapper, reports_dir):
+        today = datetime.now().strftime("%Y-%m-%d")
+        for i, suffix in enumerate(["T23:59:59.123456+05:30", " 00:00", "T12:00:00Z"]):
+            _write_scan(reports_dir, f"scan-{i}", _make_scan_entries(
+                started_at=f"{today}{suffix}", attempts=[_attempt("dan.X", 2)]
+            ))
+        stats = wrapper.get_scan_statistics(days=1)
+        assert stats["daily_trends"][0]["date"] == today
+        assert stats["daily_trends"][0]["scan_count"] == 3
+
 
 # ---------------------------------------------------------------------------
 # Top failing probes
@@ -294,16 +375,14 @@ class TestDailyTrends:
 
 class TestTopFailingProbes:
 
-    def test_probes_aggregated_by_category(self, wrapper, reports_dir):
-        _write_scan(reports_dir, "scan-1", _make_scan_entries(
-            attempts=[
-                _attempt("dan.DanJailbreak", 1),
-                _attempt("dan.DanJailbreak", 1),
-                _attempt("dan.DanOther", 2),
-                _attempt("encoding.Base64", 1),
-                _attempt("encoding.Base64", 2),
-            ]
-        ))
+    def test_probes_aggregated_by_category(self, wrapper, reports_dir, base_scan_bytes):
+        _write_attempts(reports_dir, "scan-1", base_scan_bytes, [
+            _attempt("dan.DanJailbreak", 1),
+            _attempt("dan.DanJailbreak", 1),
+            _attempt("dan.DanOther", 2),
+            _attempt("encoding.Base64", 1),
+            _attempt("encoding.Base64", 2),
+        ])
         stats = wrapper.get_scan_statistics()
         probes = {p["probe_category"]: p for p in stats["top_failing_probes"]}
         assert "dan" in probes
@@ -315,39 +394,159 @@ class TestTopFailingProbes:
         assert probes["encoding"]["failure_count"] == 1
         assert probes["encoding"]["total_count"] == 2
 
-    def test_probes_sorted_by_failure_count(self, wrapper, reports_dir):
-        _write_scan(reports_dir, "scan-1", _make_scan_entries(
-            attempts=[
-                _attempt("encoding.X", 1),
-                _attempt("dan.X", 1), _attempt("dan.X", 1), _attempt("dan.X", 1),
-                _attempt("xss.X", 1), _attempt("xss.X", 1),
-            ]
-        ))
+    def test_probes_sorted_by_failure_count(self, wrapper, reports_dir, base_scan_bytes):
+        _write_attempts(reports_dir, "scan-1", base_scan_bytes, [
+            _attempt("encoding.X", 1),
+            _attempt("dan.X", 1), _attempt("dan.X", 1), _attempt("dan.X", 1),
+            _attempt("xss.X", 1), _attempt("xss.X", 1),
+        ])
         stats = wrapper.get_scan_statistics()
         categories = [p["probe_category"] for p in stats["top_failing_probes"]]
         assert categories == ["dan", "xss", "encoding"]
 
-    def test_top_probes_capped_at_10(self, wrapper, reports_dir):
+    def test_top_probes_capped_at_10(self, wrapper, reports_dir, base_scan_bytes):
         # Create 15 different probe categories
-        attempts = []
-        for i in range(15):
-            attempts.append(_attempt(f"cat{i}.Probe", 1))
-        _write_scan(reports_dir, "scan-1", _make_scan_entries(attempts=attempts))
+        attempts = [_attempt(f"cat{i}.Probe", 1) for i in range(15)]
+        _write_attempts(reports_dir, "scan-1", base_scan_bytes, attempts)
         stats = wrapper.get_scan_statistics()
         assert len(stats["top_failing_probes"]) <= 10
 
-    def test_failure_rate_calculation(self, wrapper, reports_dir):
-        _write_scan(reports_dir, "scan-1", _make_scan_entries(
-            attempts=[
-                _attempt("dan.X", 1), _attempt("dan.X", 1),
-                _attempt("dan.X", 2), _attempt("dan.X", 2),
-            ]
-        ))
+    def test_top_probes_keep_highest_failures_in_first_seen_order(
+        self, wrapper, reports_dir, base_scan_bytes
+    ):
+        # cat0..cat11 fail once each, cat12 fails twice: cat12 leads and the
+        # one-failure ties keep first-seen order, so cat9..cat11 fall off
+        attempts = [_attempt(f"cat{i}.Probe", 1) for i in range(12)]
+        attempts += [_attempt("cat12.Probe", 1), _attempt("cat12.Probe", 1)]
+        _write_attempts(reports_dir, "scan-1", base_scan_bytes, attempts)
+        stats = wrapper.get_scan_statistics()
+        categories = [p["probe_category"] for p in stats["top_failing_probes"]]
+        assert categories == ["cat12"] + [f"cat{i}" for i in range(9)]
+
+    def test_failure_rate_calculation(self, wrapper, reports_dir, base_scan_bytes):
+        _write_attempts(reports_dir, "scan-1", base_scan_bytes, [
+            _attempt("dan.X", 1), _attempt("dan.X", 1),
+            _attempt("dan.X", 2), _attempt("dan.X", 2),
+        ])
         stats = wrapper.get_scan_statistics()
         dan = stats["top_failing_probes"][0]
         assert dan["probe_category"] == "dan"
         assert dan["failure_rate"] == 50.0
 
+    def test_category_stats_fold_probes_and_skip_other_statuses(
+        self, wrapper, reports_dir, base_scan_bytes
+    ):
+        _write_attempts(reports_dir, "scan-1", base_scan_bytes, [
+            _attempt("dan.A", 1), _attempt("dan.B", 1), _attempt("dan.A", 2),
+            _attempt("dan.B", 0), _attempt("xss.A", 2),
+            {"entry_type": "eval", "probe": "dan.A", "passed": 1},
+        ])
+        assert wrapper._compute_probe_stats("scan-1") == {
+            "dan": {"passed": 1, "failed": 2},
+            "xss": {"passed": 1, "failed": 0},
+        }
+
+    def test_probe_category_is_module_prefix(self):
+        from services.garak_wrapper import _probe_category
+        assert _probe_category("dan.DanJailbreak") == "dan"
+        assert _probe_category("encoding.InjectBase64.Sub") == "encoding"
+        assert _probe_category("unknown") == "unknown"
+
+
+# ---------------------------------------------------------------------------
+# Per-report summary memoization
+# ---------------------------------------------------------------------------
+
+class TestSummaryCache:
+
+    def _write_two_scans(self, reports_dir, base_scan_bytes):
+        _write_attempts(reports_dir, "scan-1", base_scan_bytes, [
+            _attempt("dan.X", 2), _attempt("dan.X", 1)
+        ])
+        _write_attempts(reports_dir, "scan-2", base_scan_bytes, [_attempt("xss.X", 1)])
+
+    def test_unchanged_reports_summarized_once(self, wrapper, reports_dir, base_scan_bytes):
+        self._write_two_scans(reports_dir, base_scan_bytes)
+        with patch.object(
+            wrapper, "_summarize_entries", wraps=wrapper._summarize_entries
+        ) as mock_summary, patch.object(
+            wrapper, "_tally_probe_stats", wraps=wrapper._tally_probe_stats
+        ) as mock_tally, patch.object(
+            wrapper, "_tally_attempts", wraps=wrapper._tally_attempts
+        ) as mock_walk:
+            first = wrapper.get_scan_statistics()
+            second = wrapper.get_scan_statistics()
+
+        assert mock_summary.call_count == 2
+        assert mock_tally.call_count == 2
+        # Scan info and category stats share one walk over each report's attempts
+        assert mock_walk.call_count == 2
+        assert first == second
+
+    def test_rewritten_report_resummarized(self, wrapper, reports_dir, base_scan_bytes, bump_mtime):
+        self._write_two_scans(reports_dir, base_scan_bytes)
+        assert wrapper.get_scan_statistics()["total_failed"] == 2
+
+        _write_attempts(reports_dir, "scan-2", base_scan_bytes, [
+            _attempt("xss.X", 1), _attempt("xss.X", 1)
+        ])
+        report_file = reports_dir / "garak.scan-2.report.jsonl"
+        bump_mtime(report_file)
+
+        stats = wrapper.get_scan_statistics()
+        assert stats["total_failed"] == 3
+        probes = {p["probe_category"]: p for p in stats["top_failing_probes"]}
+        assert probes["xss"]["failure_count"] == 2
+
+    def test_returned_scan_info_is_a_copy(self, wrapper, reports_dir, base_scan_bytes):
+        self._write_two_scans(reports_dir, base_scan_bytes)
+        scans = wrapper.get_all_scans()
+        for scan in scans:
+            scan["passed"] = 999
+        assert all(scan["passed"] != 999 for scan in wrapper.get_all_scans())
+
+    def test_deleted_report_summary_pruned(self, wrapper, reports_dir, base_scan_bytes):
+        self._write_two_scans(reports_dir, base_scan_bytes)
+        wrapper.get_scan_statistics()
+        assert {"scan-1", "scan-2"} <= set(wrapper._summary_cache)
+
+        (reports_dir / "garak.scan-2.report.jsonl").unlink()
+        stats = wrapper.get_scan_statistics()
+
+        assert stats["total_scans"] == 1
+        assert "scan-2" not in wrapper._summary_cache
+
+    def test_listing_skips_non_report_files(self, wrapper, reports_dir, base_scan_bytes):
+        self._write_two_scans(reports_dir, base_scan_bytes)
+        (reports_dir / "garak.scan-1.report.html").write_text("<html></html>")
+        (reports_dir / "garak.scan-1.hitlog.jsonl").write_text("{}\n")
+        (reports_dir / "garak.report.jsonl").write_text("{}\n")
+        (reports_dir / "other.report.jsonl").write_text("{}\n")
+
+        scans = wrapper.get_all_scans()
+
+        assert sorted(scan["scan_id"] for scan in scans) == ["scan-1", "scan-2"]
+        by_id = {scan["scan_id"]: scan for scan in scans}
+        assert by_id["scan-1"]["jsonl_report_path"] == str(
+            reports_dir / "garak.scan-1.report.jsonl"
+        )
+        assert "html_report_path" in by_id["scan-1"]
+
+    def test_many_reports_aggregated(self, wrapper, reports_dir, base_scan_bytes):
+        for i in range(12):
+            _write_attempts(reports_dir, f"scan-{i}", base_scan_bytes, [_attempt("dan.X", 1 + i % 2)])
+        stats = wrapper.get_scan_statistics()
+
+        assert stats["total_scans"] == 12
+        assert stats["total_passed"] == 6
+        assert stats["total_failed"] == 6
+
+    def test_invalidate_drops_summary(self, wrapper, reports_dir, base_scan_bytes):
+        self._write_two_scans(reports_dir, base_scan_bytes)
+        wrapper.get_scan_statistics()
+        wrapper.invalidate_cache("scan-1")
+        assert "scan-1" not in wrapper._summary_cache
+
 
 # ---------------------------------------------------------------------------
 # Pydantic model validation
@@ -355,16 +554,16 @@ class TestTopFailingProbes:
 
 class TestResponseModel:
 
-    def test_response_matches_model(self, wrapper, reports_dir):
+    def test_response_matches_model(self, wrapper, reports_dir, base_scan_bytes):
         """Verify the dict returned by get_scan_statistics() validates against
         the Pydantic ScanStatisticsResponse model."""
-        _write_scan(reports_dir, "scan-1", _make_scan_entries(
-            attempts=[_attempt("dan.X", 2), _attempt("dan.X", 1)]
-        ))
+        _write_attempts(reports_dir, "scan-1", base_scan_bytes, [
+            _attempt("dan.X", 2), _attempt("dan.X", 1)
+        ])
         stats = wrapper.get_scan_statistics()
 
         from models.schemas import ScanStatisticsResponse
-        response = ScanStatisticsResponse(**stats)
+        response = ScanStatisticsResponse.model_validate(stats)
         assert response.total_scans == 1
         assert response.total_tests == 2
         assert len(response.daily_trends) == 30
@@ -372,5 +571,5 @@ class TestResponseModel:
     def test_empty_validates(self, wrapper):
         stats = wrapper.get_scan_statistics()
         from models.schemas import ScanStatisticsResponse
-        response = ScanStatisticsResponse(**stats)
+        response = ScanStatisticsResponse.model_validate(stats)
         assert response.total_scans == 0
@@ -2,25 +2,95 @@
 Tests for WorkflowAnalyzer — verifies that garak's actual stdout patterns
 are parsed into workflow graph nodes, edges, and traces.
 """
-import os
-import sys
+import uuid
+from types import MappingProxyType
 
+import orjson
 import pytest
 
-# Add backend root to path so we can import modules
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
-
+import services.workflow_analyzer as workflow_analyzer_module
 from services.workflow_analyzer import WorkflowAnalyzer
-from models.schemas import WorkflowNodeType, WorkflowEdgeType
+from models.schemas import WorkflowEdgeType, WorkflowGraph, WorkflowNode, WorkflowNodeType
+
+
+# (progress line, probe name, percent)
+PROBE_LINES = [
+    (
+        "probes.encoding.InjectBase64:  42%|████▏     | 5/12 [00:55<01:13, 10.55s/it]",
+        "encoding.InjectBase64", 42,
+    ),
+    (
+        "probes.encoding.InjectBase64: 100%|██████████| 12/12 [00:55<00:00, 4.58s/it]",
+        "encoding.InjectBase64", 100,
+    ),
+    ("probes.atkgen.Tox:   0%|          | 0/25", "atkgen.Tox", 0),
+]
+
+# A realistic atkgen probe run, in output order
+ATKGEN_LINES = (
+    "probes.atkgen.Tox:  10%|█         | 1/25 [00:14<04:50, 17.09s/it]",
+    "turn 01: waiting for [llama3.2:3]:  10%|█         | 1/10",
+    "turn 02: red teaming [attackgene]:  20%|██        | 2/10",
+    "turn 03: waiting for [llama3.2:3]:  30%|███       | 3/10",
+    "turn 04: red teaming [attackgene]:  40%|████      | 4/10",
+    "probes.atkgen.Tox:  50%|█████     | 12/25",
+    "probes.atkgen.Tox: 100%|██████████| 25/25 [02:14<00:00, 5.37s/it]",
+    "atkgen.Tox  toxicity.ToxicityDetector: PASS  ok on  29/ 29",
+)
+
+# Two probes, one passing and one failing
+MULTIPROBE_LINES = (
+    "probes.encoding.InjectBase64: 100%|██████████| 12/12",
+    "encoding.InjectBase64  encoding.InjectBase64Detector: PASS  ok on  12/ 12",
+    "probes.dan.DanJailbreak: 100%|██████████| 20/20",
+    "dan.DanJailbreak  dan.DanDetector: FAIL  ok on  15/ 20",
+)
+
+# (result line, result, passed, total)
+RESULT_LINES = [
+    (
+        "encoding.InjectBase64  encoding.InjectBase64Detector: PASS  ok on   12/  12",
+        "PASS", 12, 12,
+    ),
+    ("dan.DanJailbreak  dan.DanDetector: FAIL  ok on  15/ 20", "FAIL", 15, 20),
+    ("atkgen.Tox  toxicity.ToxicityDetector: PASS  ok on  29/29", "PASS", 29, 29),
+]
+
+
+def _synth_garak_lines(count: int) -> list[str]:
+    """A synthetic garak transcript: probe runs mixed with the usual noise."""
+    template = (
+        "probes.atkgen.Tox{i}:  10%|█         | 1/25 [00:14<04:50, 17.09s/it]",
+        "turn 01: waiting for [llama3.2:3]:  10%|█         | 1/10",
+        "turn 02: red teaming [attackgene]:  20%|██        | 2/10",
+        "generating text... please wait",
+        "📜 reporting to /root/.local/share/garak/garak_runs/garak.report.jsonl",
+        "probes.atkgen.Tox{i}: 100%|██████████| 25/25 [02:14<00:00, 5.37s/it]",
+        "atkgen.Tox{i}  toxicity.ToxicityDetector: FAIL  ok on  27/ 29",
+        "  1 3/51 [00:52<13:08, 16.44s/it]",
+    )
+    return [
+        template[i % len(template)].format(i=i // len(template))
+        for i in range(count)
+    ]
 
 
-SCAN_ID = "test-scan-001"
+@pytest.fixture(scope="module")
+def analyzer():
+    """One WorkflowAnalyzer shared by the module; reset before each test."""
+    return WorkflowAnalyzer()
 
 
 @pytest.fixture
-def analyzer():
-    """Fresh WorkflowAnalyzer for each test."""
-    return WorkflowAnalyzer()
+def scan_id(analyzer):
+    """A scan id unique to this test; its workflow is dropped afterwards.
+
+    Tests never share workflow state on the module-wide analyzer, so the
+    module can be spread across pytest-xdist workers (``pytest -n auto``).
+    """
+    scan_id = f"test-scan-{uuid.uuid4().hex[:8]}"
+    yield scan_id
+    analyzer.clear_workflow(scan_id)
 
 
 # ---------------------------------------------------------------------------
@@ -30,65 +100,86 @@ def analyzer():
 class TestProbeProgress:
     """Test that probe progress lines create PROBE nodes."""
 
-    def test_probe_progress_creates_node(self, analyzer):
-        event = analyzer.process_garak_output(
-            SCAN_ID,
-            "probes.encoding.InjectBase64:  42%|████▏     | 5/12 [00:55<01:13, 10.55s/it]"
-        )
+    @pytest.mark.parametrize("line,name,pct", PROBE_LINES)
+    def test_probe_progress_creates_node(self, analyzer, scan_id, line, name, pct):
+        event = analyzer.process_garak_output(scan_id, line)
         assert event is not None
         assert event["type"] == "probe_progress"
-        assert event["probe_name"] == "encoding.InjectBase64"
-        assert event["percent"] == 42
+        assert event["probe_name"] == name
+        assert event["percent"] == pct
 
-        wf = analyzer.get_workflow_graph(SCAN_ID)
+        wf = analyzer.get_workflow_graph(scan_id)
         assert len(wf.nodes) == 1
         assert wf.nodes[0].node_type == WorkflowNodeType.PROBE
-        assert wf.nodes[0].name == "encoding.InjectBase64"
+        assert wf.nodes[0].name == name
 
-    def test_probe_progress_100_percent(self, analyzer):
-        event = analyzer.process_garak_output(
-            SCAN_ID,
-            "probes.encoding.InjectBase64: 100%|██████████| 12/12 [00:55<00:00, 4.58s/it]"
-        )
-        assert event is not None
-        assert event["percent"] == 100
-
-    def test_duplicate_probe_progress_no_extra_node(self, analyzer):
+    def test_duplicate_probe_progress_no_extra_node(self, analyzer, scan_id):
         """Multiple progress lines for same probe should not create duplicate nodes."""
         analyzer.process_garak_output(
-            SCAN_ID,
+            scan_id,
             "probes.encoding.InjectBase64:  10%|█         | 1/12"
         )
         analyzer.process_garak_output(
-            SCAN_ID,
+            scan_id,
             "probes.encoding.InjectBase64:  50%|█████     | 6/12"
         )
 
-        wf = analyzer.get_workflow_graph(SCAN_ID)
-        probe_nodes = [n for n in wf.nodes if n.node_type == WorkflowNodeType.PROBE]
+        wf = analyzer.get_workflow_graph(scan_id)
+        probe_nodes = wf.nodes_by_type[WorkflowNodeType.PROBE]
         assert len(probe_nodes) == 1
         # Progress should be updated to latest
         assert probe_nodes[0].metadata["progress"] == 50
 
-    def test_multiple_probes_create_separate_nodes(self, analyzer):
+    def test_multiple_probes_create_separate_nodes(self, analyzer, scan_id):
         analyzer.process_garak_output(
-            SCAN_ID, "probes.encoding.InjectBase64:  10%|█ | 1/12"
+            scan_id, "probes.encoding.InjectBase64:  10%|█ | 1/12"
         )
         analyzer.process_garak_output(
-            SCAN_ID, "probes.dan.DanJailbreak:   5%|▌ | 1/20"
+            scan_id, "probes.dan.DanJailbreak:   5%|▌ | 1/20"
         )
 
-        wf = analyzer.get_workflow_graph(SCAN_ID)
-        probe_nodes = [n for n in wf.nodes if n.node_type == WorkflowNodeType.PROBE]
+        wf = analyzer.get_workflow_graph(scan_id)
+        probe_nodes = wf.nodes_by_type[WorkflowNodeType.PROBE]
         assert len(probe_nodes) == 2
         names = {n.name for n in probe_nodes}
         assert names == {"encoding.InjectBase64", "dan.DanJailbreak"}
+        assert wf.find(WorkflowNodeType.PROBE, "encoding.InjectBase64") is probe_nodes[0]
+        assert wf.find(WorkflowNodeType.PROBE, "dan.DanJailbreak") is probe_nodes[1]
+        assert wf.find(WorkflowNodeType.DETECTOR, "dan.DanJailbreak") is None
+
+    def test_nodes_by_type_memoized_until_node_added(self, analyzer, scan_id):
+        analyzer.process_garak_output(scan_id, "probes.atkgen.Tox:  10%|█ | 1/25")
+        wf = analyzer.get_workflow_graph(scan_id)
+        first = wf.nodes_by_type
+        assert wf.nodes_by_type is first
+        assert first[WorkflowNodeType.DETECTOR] == []
+
+        analyzer.process_garak_output(scan_id, "probes.dan.DanJailbreak:   5%|▌ | 1/20")
+        assert wf.nodes_by_type is not first
+        assert [n.name for n in wf.nodes_by_type[WorkflowNodeType.PROBE]] == [
+            "atkgen.Tox", "dan.DanJailbreak",
+        ]
 
-    def test_probe_creates_trace(self, analyzer):
+    def test_names_are_interned(self, analyzer, scan_id):
+        # Build the line at runtime so the literal's own constant is not reused
+        line = "".join(["probes.", "encoding.InjectBase64", ":  10%|█ | 1/12"])
+        first = analyzer.process_garak_output(scan_id, line)
+        second = analyzer.process_garak_output(scan_id, line)
+        assert first["probe_name"] is second["probe_name"]
+
+        result = analyzer.process_garak_output(
+            scan_id,
+            "".join(["encoding.InjectBase64  ", "encoding.InjectBase64Detector: PASS  ok on 12/12"]),
+        )
+        assert result["probe_name"] is first["probe_name"]
+        wf = analyzer.get_workflow_graph(scan_id)
+        assert wf.nodes_by_type[WorkflowNodeType.PROBE][0].name is first["probe_name"]
+
+    def test_probe_creates_trace(self, analyzer, scan_id):
         analyzer.process_garak_output(
-            SCAN_ID, "probes.encoding.InjectBase64:  10%|█ | 1/12"
+            scan_id, "probes.encoding.InjectBase64:  10%|█ | 1/12"
         )
-        wf = analyzer.get_workflow_graph(SCAN_ID)
+        wf = analyzer.get_workflow_graph(scan_id)
         assert len(wf.traces) == 1
         assert wf.traces[0].probe_name == "encoding.InjectBase64"
 
@@ -100,13 +191,13 @@ class TestProbeProgress:
 class TestModelTurn:
     """Test that 'turn XX: waiting for [model]' lines create LLM_RESPONSE nodes."""
 
-    def test_model_turn_creates_llm_node(self, analyzer):
+    def test_model_turn_creates_llm_node(self, analyzer, scan_id):
         # First create the probe context
         analyzer.process_garak_output(
-            SCAN_ID, "probes.atkgen.Tox:  10%|█ | 1/25"
+            scan_id, "probes.atkgen.Tox:  10%|█ | 1/25"
         )
         event = analyzer.process_garak_output(
-            SCAN_ID,
+            scan_id,
             "turn 01: waiting for [llama3.2:3]:  10%|█         | 1/10"
         )
         assert event is not None
@@ -114,33 +205,33 @@ class TestModelTurn:
         assert event["model_name"] == "llama3.2:3"
         assert event["turn"] == 1
 
-        wf = analyzer.get_workflow_graph(SCAN_ID)
-        llm_nodes = [n for n in wf.nodes if n.node_type == WorkflowNodeType.LLM_RESPONSE]
+        wf = analyzer.get_workflow_graph(scan_id)
+        llm_nodes = wf.nodes_by_type[WorkflowNodeType.LLM_RESPONSE]
         assert len(llm_nodes) == 1
         assert "llama3.2:3" in llm_nodes[0].name
 
-    def test_model_turn_creates_edge_from_probe(self, analyzer):
+    def test_model_turn_creates_edge_from_probe(self, analyzer, scan_id):
         analyzer.process_garak_output(
-            SCAN_ID, "probes.atkgen.Tox:  10%|█ | 1/25"
+            scan_id, "probes.atkgen.Tox:  10%|█ | 1/25"
         )
         analyzer.process_garak_output(
-            SCAN_ID, "turn 01: waiting for [llama3.2:3]:  10%|█ | 1/10"
+            scan_id, "turn 01: waiting for [llama3.2:3]:  10%|█ | 1/10"
         )
 
-        wf = analyzer.get_workflow_graph(SCAN_ID)
+        wf = analyzer.get_workflow_graph(scan_id)
         assert len(wf.edges) == 1
         assert wf.edges[0].edge_type == WorkflowEdgeType.PROMPT
         assert "probe_" in wf.edges[0].source_id
         assert "llm_" in wf.edges[0].target_id
 
-    def test_model_turn_updates_statistics(self, analyzer):
+    def test_model_turn_updates_statistics(self, analyzer, scan_id):
         analyzer.process_garak_output(
-            SCAN_ID, "probes.atkgen.Tox:  10%|█ | 1/25"
+            scan_id, "probes.atkgen.Tox:  10%|█ | 1/25"
         )
         analyzer.process_garak_output(
-            SCAN_ID, "turn 01: waiting for [llama3.2:3]:  10%|█ | 1/10"
+            scan_id, "turn 01: waiting for [llama3.2:3]:  10%|█ | 1/10"
         )
-        wf = analyzer.get_workflow_graph(SCAN_ID)
+        wf = analyzer.get_workflow_graph(scan_id)
         assert wf.statistics["total_responses"] == 1
         assert wf.statistics["total_interactions"] == 1
 
@@ -152,12 +243,12 @@ class TestModelTurn:
 class TestGeneratorTurn:
     """Test that 'turn XX: red teaming [generator]' lines create GENERATOR nodes."""
 
-    def test_generator_turn_creates_node(self, analyzer):
+    def test_generator_turn_creates_node(self, analyzer, scan_id):
         analyzer.process_garak_output(
-            SCAN_ID, "probes.atkgen.Tox:  10%|█ | 1/25"
+            scan_id, "probes.atkgen.Tox:  10%|█ | 1/25"
         )
         event = analyzer.process_garak_output(
-            SCAN_ID,
+            scan_id,
             "turn 02: red teaming [attackgene]:  20%|██        | 2/10"
         )
         assert event is not None
@@ -165,19 +256,19 @@ class TestGeneratorTurn:
         assert event["generator_name"] == "attackgene"
         assert event["turn"] == 2
 
-        wf = analyzer.get_workflow_graph(SCAN_ID)
-        gen_nodes = [n for n in wf.nodes if n.node_type == WorkflowNodeType.GENERATOR]
+        wf = analyzer.get_workflow_graph(scan_id)
+        gen_nodes = wf.nodes_by_type[WorkflowNodeType.GENERATOR]
         assert len(gen_nodes) == 1
 
-    def test_generator_turn_creates_chain_edge(self, analyzer):
+    def test_generator_turn_creates_chain_edge(self, analyzer, scan_id):
         analyzer.process_garak_output(
-            SCAN_ID, "probes.atkgen.Tox:  10%|█ | 1/25"
+            scan_id, "probes.atkgen.Tox:  10%|█ | 1/25"
         )
         analyzer.process_garak_output(
-            SCAN_ID, "turn 02: red teaming [attackgene]:  20%|██ | 2/10"
+            scan_id, "turn 02: red teaming [attackgene]:  20%|██ | 2/10"
         )
 
-        wf = analyzer.get_workflow_graph(SCAN_ID)
+        wf = analyzer.get_workflow_graph(scan_id)
         chain_edges = [e for e in wf.edges if e.edge_type == WorkflowEdgeType.CHAIN]
         assert len(chain_edges) == 1
 
@@ -189,110 +280,105 @@ class TestGeneratorTurn:
 class TestProbeResult:
     """Test that result lines create DETECTOR nodes and optionally VULNERABILITY nodes."""
 
-    def test_pass_result_creates_detector_node(self, analyzer):
-        analyzer.process_garak_output(
-            SCAN_ID, "probes.encoding.InjectBase64: 100%|██████| 12/12"
-        )
-        event = analyzer.process_garak_output(
-            SCAN_ID,
-            "encoding.InjectBase64  encoding.InjectBase64Detector: PASS  ok on   12/  12"
-        )
+    @pytest.mark.parametrize("line,result,passed,total", RESULT_LINES)
+    def test_result_creates_detector_node(self, analyzer, scan_id, line, result, passed, total):
+        event = analyzer.process_garak_output(scan_id, line)
         assert event is not None
         assert event["type"] == "probe_result"
-        assert event["result"] == "PASS"
-        assert event["passed"] == 12
-        assert event["total"] == 12
+        assert event["result"] == result
+        assert event["passed"] == passed
+        assert event["total"] == total
 
-        wf = analyzer.get_workflow_graph(SCAN_ID)
-        det_nodes = [n for n in wf.nodes if n.node_type == WorkflowNodeType.DETECTOR]
+        wf = analyzer.get_workflow_graph(scan_id)
+        det_nodes = wf.nodes_by_type[WorkflowNodeType.DETECTOR]
         assert len(det_nodes) == 1
-        assert det_nodes[0].metadata["result"] == "PASS"
+        assert det_nodes[0].metadata["result"] == result
+        assert det_nodes[0].metadata["failed"] == total - passed
+        vuln_nodes = wf.nodes_by_type[WorkflowNodeType.VULNERABILITY]
+        assert len(vuln_nodes) == (1 if result == "FAIL" else 0)
 
-    def test_pass_result_no_vulnerability_node(self, analyzer):
+    def test_pass_result_no_vulnerability_node(self, analyzer, scan_id):
         analyzer.process_garak_output(
-            SCAN_ID, "probes.encoding.InjectBase64: 100%|██████| 12/12"
+            scan_id, "probes.encoding.InjectBase64: 100%|██████| 12/12"
         )
         analyzer.process_garak_output(
-            SCAN_ID,
+            scan_id,
             "encoding.InjectBase64  encoding.InjectBase64Detector: PASS  ok on  12/12"
         )
 
-        wf = analyzer.get_workflow_graph(SCAN_ID)
-        vuln_nodes = [n for n in wf.nodes if n.node_type == WorkflowNodeType.VULNERABILITY]
+        wf = analyzer.get_workflow_graph(scan_id)
+        vuln_nodes = wf.nodes_by_type[WorkflowNodeType.VULNERABILITY]
         assert len(vuln_nodes) == 0
 
-    def test_fail_result_creates_vulnerability_node(self, analyzer):
+    def test_fail_result_creates_vulnerability_node(self, analyzer, scan_id):
         analyzer.process_garak_output(
-            SCAN_ID, "probes.dan.DanJailbreak:  100%|██████| 20/20"
+            scan_id, "probes.dan.DanJailbreak:  100%|██████| 20/20"
         )
-        event = analyzer.process_garak_output(
-            SCAN_ID,
+        analyzer.process_garak_output(
+            scan_id,
             "dan.DanJailbreak  dan.DanDetector: FAIL  ok on  15/ 20"
         )
-        assert event["result"] == "FAIL"
-        assert event["passed"] == 15
-        assert event["total"] == 20
 
-        wf = analyzer.get_workflow_graph(SCAN_ID)
-        vuln_nodes = [n for n in wf.nodes if n.node_type == WorkflowNodeType.VULNERABILITY]
+        wf = analyzer.get_workflow_graph(scan_id)
+        vuln_nodes = wf.nodes_by_type[WorkflowNodeType.VULNERABILITY]
         assert len(vuln_nodes) == 1
         assert vuln_nodes[0].metadata["failed"] == 5
         assert wf.statistics["vulnerabilities_found"] == 1
 
-    def test_fail_creates_vulnerability_finding_in_trace(self, analyzer):
+    def test_fail_creates_vulnerability_finding_in_trace(self, analyzer, scan_id):
         analyzer.process_garak_output(
-            SCAN_ID, "probes.dan.DanJailbreak: 100%|██████| 20/20"
+            scan_id, "probes.dan.DanJailbreak: 100%|██████| 20/20"
         )
         analyzer.process_garak_output(
-            SCAN_ID, "dan.DanJailbreak  dan.DanDetector: FAIL  ok on  15/ 20"
+            scan_id, "dan.DanJailbreak  dan.DanDetector: FAIL  ok on  15/ 20"
         )
 
-        wf = analyzer.get_workflow_graph(SCAN_ID)
+        wf = analyzer.get_workflow_graph(scan_id)
         trace = wf.traces[0]
         assert len(trace.vulnerability_findings) == 1
         assert trace.vulnerability_findings[0].probe_name == "dan.DanJailbreak"
 
-    def test_result_marks_probe_completed(self, analyzer):
+    def test_result_marks_probe_completed(self, analyzer, scan_id):
         analyzer.process_garak_output(
-            SCAN_ID, "probes.encoding.InjectBase64: 100%|██████| 12/12"
+            scan_id, "probes.encoding.InjectBase64: 100%|██████| 12/12"
         )
         analyzer.process_garak_output(
-            SCAN_ID,
+            scan_id,
             "encoding.InjectBase64  encoding.InjectBase64Detector: PASS  ok on  12/12"
         )
 
-        wf = analyzer.get_workflow_graph(SCAN_ID)
-        probe_node = [n for n in wf.nodes if n.node_type == WorkflowNodeType.PROBE][0]
+        wf = analyzer.get_workflow_graph(scan_id)
+        probe_node = wf.nodes_by_type[WorkflowNodeType.PROBE][0]
         assert probe_node.metadata["status"] == "completed"
 
-    def test_result_creates_detection_edge(self, analyzer):
+    def test_result_creates_detection_edge(self, analyzer, scan_id):
         analyzer.process_garak_output(
-            SCAN_ID, "probes.encoding.InjectBase64: 100%|██████| 12/12"
+            scan_id, "probes.encoding.InjectBase64: 100%|██████| 12/12"
         )
         analyzer.process_garak_output(
-            SCAN_ID,
+            scan_id,
             "encoding.InjectBase64  encoding.InjectBase64Detector: PASS  ok on  12/12"
         )
 
-        wf = analyzer.get_workflow_graph(SCAN_ID)
+        wf = analyzer.get_workflow_graph(scan_id)
         det_edges = [e for e in wf.edges if e.edge_type == WorkflowEdgeType.DETECTION]
         assert len(det_edges) == 1
         assert "probe_" in det_edges[0].source_id
         assert "det_" in det_edges[0].target_id
 
-    def test_result_without_prior_progress(self, analyzer):
+    def test_result_without_prior_progress(self, analyzer, scan_id):
         """Result line for a probe we never saw progress for should still work."""
         event = analyzer.process_garak_output(
-            SCAN_ID,
+            scan_id,
             "encoding.InjectBase64  encoding.InjectBase64Detector: PASS  ok on  12/12"
         )
         assert event is not None
         assert event["type"] == "probe_result"
 
-        wf = analyzer.get_workflow_graph(SCAN_ID)
+        wf = analyzer.get_workflow_graph(scan_id)
         # Should have created probe node + detector node
-        probe_nodes = [n for n in wf.nodes if n.node_type == WorkflowNodeType.PROBE]
-        det_nodes = [n for n in wf.nodes if n.node_type == WorkflowNodeType.DETECTOR]
+        probe_nodes = wf.nodes_by_type[WorkflowNodeType.PROBE]
+        det_nodes = wf.nodes_by_type[WorkflowNodeType.DETECTOR]
         assert len(probe_nodes) == 1
         assert len(det_nodes) == 1
 
@@ -304,29 +390,22 @@ class TestProbeResult:
 class TestAtkgenFlow:
     """Test a realistic atkgen probe output sequence."""
 
-    def test_full_atkgen_flow(self, analyzer):
-        lines = [
-            "probes.atkgen.Tox:  10%|█         | 1/25 [00:14<04:50, 17.09s/it]",
-            "turn 01: waiting for [llama3.2:3]:  10%|█         | 1/10",
-            "turn 02: red teaming [attackgene]:  20%|██        | 2/10",
-            "turn 03: waiting for [llama3.2:3]:  30%|███       | 3/10",
-            "turn 04: red teaming [attackgene]:  40%|████      | 4/10",
-            "probes.atkgen.Tox:  50%|█████     | 12/25",
-            "probes.atkgen.Tox: 100%|██████████| 25/25 [02:14<00:00, 5.37s/it]",
-            "atkgen.Tox  toxicity.ToxicityDetector: PASS  ok on  29/ 29",
+    def test_full_atkgen_flow(self, analyzer, scan_id):
+        events = list(analyzer.process_garak_stream(scan_id, ATKGEN_LINES))
+        assert [e["type"] for e in events] == [
+            "probe_progress", "model_turn", "generator_turn", "model_turn",
+            "generator_turn", "probe_progress", "probe_progress", "probe_result",
         ]
 
-        for line in lines:
-            analyzer.process_garak_output(SCAN_ID, line)
-
-        wf = analyzer.get_workflow_graph(SCAN_ID)
+        wf = analyzer.get_workflow_graph(scan_id)
 
         # 1 probe + 2 LLM + 2 generator + 1 detector = 6 nodes
         assert len(wf.nodes) == 6
-        probe_nodes = [n for n in wf.nodes if n.node_type == WorkflowNodeType.PROBE]
-        llm_nodes = [n for n in wf.nodes if n.node_type == WorkflowNodeType.LLM_RESPONSE]
-        gen_nodes = [n for n in wf.nodes if n.node_type == WorkflowNodeType.GENERATOR]
-        det_nodes = [n for n in wf.nodes if n.node_type == WorkflowNodeType.DETECTOR]
+        buckets = wf.nodes_by_type
+        probe_nodes = buckets[WorkflowNodeType.PROBE]
+        llm_nodes = buckets[WorkflowNodeType.LLM_RESPONSE]
+        gen_nodes = buckets[WorkflowNodeType.GENERATOR]
+        det_nodes = buckets[WorkflowNodeType.DETECTOR]
 
         assert len(probe_nodes) == 1
         assert len(llm_nodes) == 2
@@ -342,6 +421,32 @@ class TestAtkgenFlow:
         assert wf.statistics["total_prompts"] == 2
         assert wf.statistics["vulnerabilities_found"] == 0
 
+    def test_batch_returns_events_for_matched_lines(self, analyzer, scan_id):
+        events = analyzer.process_garak_output_batch(scan_id, [
+            "probes.atkgen.Tox:  10%|█ | 1/25",
+            "",
+            "some random output",
+            "turn 01: waiting for [llama3.2:3]:  10%|█ | 1/10",
+            "atkgen.Tox  toxicity.ToxicityDetector: PASS  ok on  29/ 29",
+        ])
+        assert [e["type"] for e in events] == ["probe_progress", "model_turn", "probe_result"]
+
+    def test_stream_is_lazy(self, analyzer, scan_id):
+        lines = iter([
+            "probes.atkgen.Tox:  10%|█ | 1/25",
+            "turn 01: waiting for [llama3.2:3]:  10%|█ | 1/10",
+        ])
+        stream = analyzer.process_garak_stream(scan_id, lines)
+        assert next(stream)["type"] == "probe_progress"
+        assert len(analyzer.get_workflow_graph(scan_id).nodes) == 1
+
+        assert [e["type"] for e in stream] == ["model_turn"]
+        assert len(analyzer.get_workflow_graph(scan_id).nodes) == 2
+
+    def test_empty_batch_creates_empty_workflow(self, analyzer, scan_id):
+        assert analyzer.process_garak_output_batch(scan_id, []) == []
+        assert analyzer.get_workflow_graph(scan_id).nodes == []
+
 
 # ---------------------------------------------------------------------------
 # Multi-probe scan
@@ -350,17 +455,10 @@ class TestAtkgenFlow:
 class TestMultiProbeScan:
     """Test a scan with multiple probes."""
 
-    def test_multiple_probes_with_mixed_results(self, analyzer):
-        lines = [
-            "probes.encoding.InjectBase64: 100%|██████████| 12/12",
-            "encoding.InjectBase64  encoding.InjectBase64Detector: PASS  ok on  12/ 12",
-            "probes.dan.DanJailbreak: 100%|██████████| 20/20",
-            "dan.DanJailbreak  dan.DanDetector: FAIL  ok on  15/ 20",
-        ]
-        for line in lines:
-            analyzer.process_garak_output(SCAN_ID, line)
+    def test_multiple_probes_with_mixed_results(self, analyzer, scan_id):
+        analyzer.process_garak_output_batch(scan_id, MULTIPROBE_LINES)
 
-        wf = analyzer.get_workflow_graph(SCAN_ID)
+        wf = analyzer.get_workflow_graph(scan_id)
         assert wf.statistics["probes_executed"] == 2
         assert wf.statistics["vulnerabilities_found"] == 1
 
@@ -376,72 +474,197 @@ class TestMultiProbeScan:
 class TestTimeline:
     """Test timeline generation."""
 
-    def test_timeline_returns_sorted_events(self, analyzer):
-        analyzer.process_garak_output(
-            SCAN_ID, "probes.encoding.InjectBase64: 100%|██████| 12/12"
-        )
-        analyzer.process_garak_output(
-            SCAN_ID,
-            "encoding.InjectBase64  encoding.InjectBase64Detector: PASS  ok on  12/12"
-        )
+    def test_timeline_returns_sorted_events(self, analyzer, scan_id):
+        analyzer.process_garak_output_batch(scan_id, [
+            "probes.encoding.InjectBase64: 100%|██████| 12/12",
+            "encoding.InjectBase64  encoding.InjectBase64Detector: PASS  ok on  12/12",
+        ])
 
-        timeline = analyzer.get_workflow_timeline(SCAN_ID)
+        timeline = analyzer.get_workflow_timeline(scan_id)
         assert len(timeline) == 2
         assert timeline[0].timestamp <= timeline[1].timestamp
 
+    def test_timeline_insertion_scales(self):
+        """10k out-of-order add_node calls keep nodes_by_time sorted and stable."""
+        wf = WorkflowGraph(scan_id="timeline-scale")
+        for i in range(10_000):
+            wf.add_node(WorkflowNode(
+                node_id=f"n{i}", node_type=WorkflowNodeType.PROBE,
+                name=f"p{i}", timestamp=float((i * 7919) % 1000),
+            ))
+        ordered = wf.nodes_by_time
+        assert len(ordered) == 10_000
+        keys = [(n.timestamp, int(n.node_id[1:])) for n in ordered]
+        assert keys == sorted(keys)
+
+    def test_timeline_sees_directly_appended_nodes(self, analyzer, scan_id):
+        analyzer.process_garak_output(scan_id, "probes.atkgen.Tox:  10%|█ | 1/25")
+        wf = analyzer.get_workflow_graph(scan_id)
+        wf.nodes.append(WorkflowNode(
+            node_id="early", node_type=WorkflowNodeType.PROBE, name="early", timestamp=0.0,
+        ))
+        timeline = analyzer.get_workflow_timeline(scan_id)
+        assert [e.node_id for e in timeline] == ["early", "probe_atkgen_Tox"]
+
+    def test_timeline_attaches_prompt_edges(self, analyzer, scan_id):
+        analyzer.process_garak_output_batch(scan_id, ATKGEN_LINES)
+        timeline = analyzer.get_workflow_timeline(scan_id)
+
+        llm_events = [e for e in timeline if e.event_type == "llm_response"]
+        assert len(llm_events) == 2
+        # PROMPT edges are created with empty full_content
+        assert all(e.prompt == "" for e in llm_events)
+        assert all(e.prompt is None for e in timeline if e.event_type != "llm_response")
+        assert all(e.response is None for e in timeline)
+
     def test_timeline_empty_for_unknown_scan(self, analyzer):
         timeline = analyzer.get_workflow_timeline("nonexistent")
         assert timeline == []
 
 
+# ---------------------------------------------------------------------------
+# Throughput (pytest-benchmark)
+# ---------------------------------------------------------------------------
+
+class TestThroughput:
+    """Guards per-line parsing cost against regex regressions."""
+
+    # Far above the current cost (tens of microseconds); catches blowups
+    # such as catastrophic backtracking, not small drifts
+    MAX_MEDIAN_SECONDS_PER_LINE = 1e-3
+
+    def test_process_garak_output_benchmark(self, benchmark, analyzer, scan_id):
+        lines = _synth_garak_lines(1000)
+
+        def run():
+            analyzer.clear_workflow(scan_id)
+            for line in lines:
+                analyzer.process_garak_output(scan_id, line)
+
+        benchmark(run)
+
+        assert len(analyzer.get_workflow_graph(scan_id).nodes_by_type[
+            WorkflowNodeType.PROBE
+        ]) == 125
+        # benchmark.stats is None when benchmarking is disabled (e.g. under xdist)
+        if benchmark.stats is not None:
+            median = benchmark.stats.stats.median
+            assert median / len(lines) < self.MAX_MEDIAN_SECONDS_PER_LINE
+
+
 # ---------------------------------------------------------------------------
 # Edge cases
 # ---------------------------------------------------------------------------
 
-class TestEdgeCases:
-    """Edge cases and non-matching lines."""
+PRIMED_SCAN_ID = "primed-scan"
 
-    def test_empty_line_returns_none(self, analyzer):
-        assert analyzer.process_garak_output(SCAN_ID, "") is None
-        assert analyzer.process_garak_output(SCAN_ID, "   ") is None
 
-    def test_unmatched_line_returns_none(self, analyzer):
-        assert analyzer.process_garak_output(SCAN_ID, "some random output") is None
+@pytest.fixture(scope="module")
+def primed_analyzer():
+    """An analyzer holding one in-progress probe, shared by the export tests."""
+    analyzer = WorkflowAnalyzer()
+    analyzer.process_garak_output(
+        PRIMED_SCAN_ID, "probes.encoding.InjectBase64: 50%|█████| 6/12"
+    )
+    return analyzer
 
-    def test_clear_workflow(self, analyzer):
+
+class TestEdgeCases:
+    """Edge cases and non-matching lines."""
+
+    def test_empty_line_returns_none(self, analyzer, scan_id):
+        assert analyzer.process_garak_output(scan_id, "") is None
+        assert analyzer.process_garak_output(scan_id, "   ") is None
+
+    def test_unmatched_line_returns_none(self, analyzer, scan_id):
+        assert analyzer.process_garak_output(scan_id, "some random output") is None
+
+    @pytest.mark.parametrize("line", [
+        "some random output",
+        "📜 logging to /root/.local/share/garak/garak_runs/garak.abc.report.jsonl",
+        "🕵️  queue of probes: encoding.InjectBase64",
+        "✔️  garak run complete in 55.12s",
+    ])
+    def test_noise_lines_fast_path(self, analyzer, scan_id, monkeypatch, line):
+        """Lines without any pattern's required literal never reach a regex."""
+        class _NoSearch:
+            def search(self, line):
+                raise AssertionError(f"regex tried on noise line: {line!r}")
+
+        for name in ("_PROBE_PROGRESS_RE", "_MODEL_TURN_RE",
+                     "_GENERATOR_TURN_RE", "_PROBE_RESULT_RE"):
+            monkeypatch.setattr(workflow_analyzer_module, name, _NoSearch())
+
+        assert analyzer.process_garak_output(scan_id, line) is None
+        assert analyzer.get_workflow_graph(scan_id).nodes == []
+
+    def test_clear_workflow(self, analyzer, scan_id):
         analyzer.process_garak_output(
-            SCAN_ID, "probes.encoding.InjectBase64: 50%|█████| 6/12"
+            scan_id, "probes.encoding.InjectBase64: 50%|█████| 6/12"
         )
-        assert analyzer.get_workflow_graph(SCAN_ID) is not None
+        assert analyzer.get_workflow_graph(scan_id) is not None
 
-        analyzer.clear_workflow(SCAN_ID)
-        assert analyzer.get_workflow_graph(SCAN_ID) is None
+        analyzer.clear_workflow(scan_id)
+        assert analyzer.get_workflow_graph(scan_id) is None
 
     def test_clear_nonexistent_workflow(self, analyzer):
         """clear_workflow for unknown scan should not raise."""
         analyzer.clear_workflow("nonexistent")
 
-    def test_export_json(self, analyzer):
+    @pytest.mark.parametrize("fmt,check", [
+        ("json", lambda export: '"scan_id"' in export and PRIMED_SCAN_ID in export),
+        ("mermaid", lambda export: "graph TD" in export and "encoding.InjectBase64" in export),
+    ])
+    def test_export_format(self, primed_analyzer, fmt, check):
+        assert check(primed_analyzer.export_workflow(PRIMED_SCAN_ID, fmt))
+
+    def test_export_unknown_format_raises(self, primed_analyzer):
+        with pytest.raises(ValueError, match="Unsupported"):
+            primed_analyzer.export_workflow(PRIMED_SCAN_ID, "pdf")
+
+    def test_export_json_orjson_roundtrip(self, analyzer, scan_id):
+        analyzer.process_garak_output_batch(scan_id, [
+            "probes.dan.DanJailbreak: 100%|██████████| 20/20",
+            "dan.DanJailbreak  dan.DanDetector: FAIL  ok on  15/ 20",
+        ])
+        data = orjson.loads(analyzer.export_workflow(scan_id, "json"))
+        assert data["scan_id"] == scan_id
+        assert [n["node_type"] for n in data["nodes"]] == ["probe", "detector", "vulnerability"]
+        assert {e["edge_type"] for e in data["edges"]} == {"detection"}
+        assert data["statistics"]["vulnerabilities_found"] == 1
+        assert data["traces"][0]["vulnerability_findings"][0]["probe_name"] == "dan.DanJailbreak"
+
+    def test_export_cached_when_unchanged(self, analyzer, scan_id):
         analyzer.process_garak_output(
-            SCAN_ID, "probes.encoding.InjectBase64: 50%|█████| 6/12"
+            scan_id, "probes.encoding.InjectBase64: 50%|█████| 6/12"
         )
-        export = analyzer.export_workflow(SCAN_ID, "json")
-        assert '"scan_id"' in export
-        assert SCAN_ID in export
+        for fmt in ("json", "mermaid"):
+            assert analyzer.export_workflow(scan_id, fmt) is analyzer.export_workflow(scan_id, fmt)
 
-    def test_export_mermaid(self, analyzer):
+    def test_export_refreshed_after_change(self, analyzer, scan_id):
         analyzer.process_garak_output(
-            SCAN_ID, "probes.encoding.InjectBase64: 50%|█████| 6/12"
+            scan_id, "probes.encoding.InjectBase64: 50%|█████| 6/12"
         )
-        export = analyzer.export_workflow(SCAN_ID, "mermaid")
-        assert "graph TD" in export
+        first = analyzer.export_workflow(scan_id, "json")
 
-    def test_export_unknown_format_raises(self, analyzer):
+        # Progress only updates node metadata in place
         analyzer.process_garak_output(
-            SCAN_ID, "probes.encoding.InjectBase64: 50%|█████| 6/12"
+            scan_id, "probes.encoding.InjectBase64: 75%|███████▌  | 9/12"
         )
-        with pytest.raises(ValueError, match="Unsupported"):
-            analyzer.export_workflow(SCAN_ID, "pdf")
+        second = analyzer.export_workflow(scan_id, "json")
+        assert second != first
+        assert '"progress": 75' in second
+
+        analyzer.process_garak_output(scan_id, "some random output")
+        assert analyzer.export_workflow(scan_id, "json") is second
+
+    def test_export_not_reused_after_clear(self, analyzer, scan_id):
+        analyzer.process_garak_output(scan_id, "probes.atkgen.Tox:  10%|█ | 1/25")
+        first = analyzer.export_workflow(scan_id, "mermaid")
+        analyzer.clear_workflow(scan_id)
+        analyzer.process_garak_output(scan_id, "probes.dan.DanJailbreak:   5%|▌ | 1/20")
+        assert "dan.DanJailbreak" in analyzer.export_workflow(scan_id, "mermaid")
+        assert "atkgen.Tox" in first
 
     def test_export_nonexistent_scan_returns_empty(self, analyzer):
         assert analyzer.export_workflow("nonexistent") == ""
@@ -451,131 +674,162 @@ class TestEdgeCases:
 # build_from_report_entries (JSONL fallback for completed scans)
 # ---------------------------------------------------------------------------
 
+# Shared by every TestBuildFromReport test; read-only views so none can mutate it
+REPORT_ENTRIES = tuple(MappingProxyType(entry) for entry in (
+    {
+        "entry_type": "config",
+        "plugins.target_type": "ollama",
+        "plugins.target_name": "llama3.2:3b",
+        "transient.starttime_iso": "2025-01-01T00:00:00",
+    },
+    {
+        "entry_type": "attempt",
+        "probe_classname": "dan.DanJailbreak",
+        "status": 2,
+        "goal": "Jailbreak the model",
+    },
+    {
+        "entry_type": "attempt",
+        "probe_classname": "dan.DanJailbreak",
+        "status": 1,
+        "goal": "Jailbreak the model",
+    },
+    {
+        "entry_type": "attempt",
+        "probe_classname": "encoding.InjectBase64",
+        "status": 2,
+        "goal": "Inject encoded content",
+    },
+    {
+        "entry_type": "eval",
+        "probe": "dan.DanJailbreak",
+        "detector": "dan.DanDetector",
+        "passed": 1,
+        "total": 2,
+    },
+    {
+        "entry_type": "eval",
+        "probe": "encoding.InjectBase64",
+        "detector": "encoding.InjectBase64Detector",
+        "passed": 1,
+        "total": 1,
+    },
+))
+
+
+@pytest.fixture(scope="session")
+def prebuilt_report_graph():
+    """REPORT_ENTRIES built once, for tests that only read the graph."""
+    return WorkflowAnalyzer().build_from_report_entries("shared-scan", REPORT_ENTRIES)
+
+
 class TestBuildFromReport:
     """Test building workflow from JSONL report entries."""
 
-    REPORT_ENTRIES = [
-        {
-            "entry_type": "config",
-            "plugins.target_type": "ollama",
-            "plugins.target_name": "llama3.2:3b",
-            "transient.starttime_iso": "2025-01-01T00:00:00",
-        },
-        {
-            "entry_type": "attempt",
-            "probe_classname": "dan.DanJailbreak",
-            "status": 2,
-            "goal": "Jailbreak the model",
-        },
-        {
-            "entry_type": "attempt",
-            "probe_classname": "dan.DanJailbreak",
-            "status": 1,
-            "goal": "Jailbreak the model",
-        },
-        {
-            "entry_type": "attempt",
-            "probe_classname": "encoding.InjectBase64",
-            "status": 2,
-            "goal": "Inject encoded content",
-        },
-        {
-            "entry_type": "eval",
-            "probe": "dan.DanJailbreak",
-            "detector": "dan.DanDetector",
-            "passed": 1,
-            "total": 2,
-        },
-        {
-            "entry_type": "eval",
-            "probe": "encoding.InjectBase64",
-            "detector": "encoding.InjectBase64Detector",
-            "passed": 1,
-            "total": 1,
-        },
-    ]
-
-    def test_builds_workflow_from_entries(self, analyzer):
-        wf = analyzer.build_from_report_entries(SCAN_ID, self.REPORT_ENTRIES)
+    def test_builds_workflow_from_entries(self, analyzer, scan_id):
+        wf = analyzer.build_from_report_entries(scan_id, REPORT_ENTRIES)
         assert wf is not None
-        assert wf.scan_id == SCAN_ID
+        assert wf.scan_id == scan_id
 
-    def test_creates_probe_nodes(self, analyzer):
-        wf = analyzer.build_from_report_entries(SCAN_ID, self.REPORT_ENTRIES)
-        probes = [n for n in wf.nodes if n.node_type == WorkflowNodeType.PROBE]
+    def test_creates_probe_nodes(self, prebuilt_report_graph):
+        wf = prebuilt_report_graph
+        probes = wf.nodes_by_type[WorkflowNodeType.PROBE]
         assert len(probes) == 2
         names = {n.name for n in probes}
         assert names == {"dan.DanJailbreak", "encoding.InjectBase64"}
 
-    def test_creates_detector_nodes_from_eval(self, analyzer):
-        wf = analyzer.build_from_report_entries(SCAN_ID, self.REPORT_ENTRIES)
-        detectors = [n for n in wf.nodes if n.node_type == WorkflowNodeType.DETECTOR]
+    def test_creates_detector_nodes_from_eval(self, prebuilt_report_graph):
+        wf = prebuilt_report_graph
+        detectors = wf.nodes_by_type[WorkflowNodeType.DETECTOR]
         assert len(detectors) == 2
         names = {n.name for n in detectors}
         assert names == {"dan.DanDetector", "encoding.InjectBase64Detector"}
 
-    def test_creates_vulnerability_for_fail(self, analyzer):
-        wf = analyzer.build_from_report_entries(SCAN_ID, self.REPORT_ENTRIES)
-        vulns = [n for n in wf.nodes if n.node_type == WorkflowNodeType.VULNERABILITY]
+    def test_creates_vulnerability_for_fail(self, prebuilt_report_graph):
+        wf = prebuilt_report_graph
+        vulns = wf.nodes_by_type[WorkflowNodeType.VULNERABILITY]
         # dan.DanJailbreak FAIL (1/2), encoding passes (1/1)
         assert len(vulns) == 1
         assert "dan.DanJailbreak" in vulns[0].name
 
-    def test_no_vulnerability_for_pass(self, analyzer):
+    def test_no_vulnerability_for_pass(self, analyzer, scan_id):
         """All-passing entries should produce no vulnerability nodes."""
         entries = [
             {"entry_type": "config", "plugins.target_name": "test"},
             {"entry_type": "attempt", "probe_classname": "a.B", "status": 2},
             {"entry_type": "eval", "probe": "a.B", "detector": "a.D", "passed": 1, "total": 1},
         ]
-        wf = analyzer.build_from_report_entries(SCAN_ID, entries)
-        vulns = [n for n in wf.nodes if n.node_type == WorkflowNodeType.VULNERABILITY]
+        wf = analyzer.build_from_report_entries(scan_id, entries)
+        vulns = wf.nodes_by_type[WorkflowNodeType.VULNERABILITY]
         assert len(vulns) == 0
 
-    def test_stores_target_model_in_layout_hints(self, analyzer):
-        wf = analyzer.build_from_report_entries(SCAN_ID, self.REPORT_ENTRIES)
+    def test_stores_target_model_in_layout_hints(self, prebuilt_report_graph):
+        wf = prebuilt_report_graph
         assert wf.layout_hints.get("target_model") == "llama3.2:3b"
 
-    def test_creates_detection_edges(self, analyzer):
-        wf = analyzer.build_from_report_entries(SCAN_ID, self.REPORT_ENTRIES)
+    def test_creates_detection_edges(self, prebuilt_report_graph):
+        wf = prebuilt_report_graph
         det_edges = [e for e in wf.edges if e.edge_type == WorkflowEdgeType.DETECTION]
         # 2 probe→detector edges + 1 detector→vulnerability edge = 3
         assert len(det_edges) == 3
 
-    def test_returns_none_for_empty_entries(self, analyzer):
-        wf = analyzer.build_from_report_entries(SCAN_ID, [])
+    def test_returns_none_for_empty_entries(self, analyzer, scan_id):
+        wf = analyzer.build_from_report_entries(scan_id, [])
         assert wf is None
 
-    def test_returns_none_for_no_useful_data(self, analyzer):
+    def test_returns_none_for_no_useful_data(self, analyzer, scan_id):
         """Config-only entries produce no nodes → returns None."""
         entries = [{"entry_type": "config", "plugins.target_name": "test"}]
-        wf = analyzer.build_from_report_entries(SCAN_ID, entries)
+        wf = analyzer.build_from_report_entries(scan_id, entries)
         assert wf is None
 
-    def test_attempts_without_eval_still_create_probe_nodes(self, analyzer):
+    def test_attempts_without_eval_still_create_probe_nodes(self, analyzer, scan_id):
         """If there are attempts but no eval entries, probes should still appear."""
         entries = [
             {"entry_type": "attempt", "probe_classname": "a.Probe1", "status": 2, "goal": "Test"},
             {"entry_type": "attempt", "probe_classname": "a.Probe1", "status": 1, "goal": "Test"},
         ]
-        wf = analyzer.build_from_report_entries(SCAN_ID, entries)
+        wf = analyzer.build_from_report_entries(scan_id, entries)
         assert wf is not None
-        probes = [n for n in wf.nodes if n.node_type == WorkflowNodeType.PROBE]
+        probes = wf.nodes_by_type[WorkflowNodeType.PROBE]
         assert len(probes) == 1
         assert probes[0].metadata["passed"] == 1
         assert probes[0].metadata["failed"] == 1
 
-    def test_graph_is_cached_after_build(self, analyzer):
+    def test_large_report_attempt_counts(self, analyzer, scan_id):
+        """100k attempts over 50 probes (no eval entries) are tallied per probe."""
+        entries = [
+            {
+                "entry_type": "attempt",
+                "probe_classname": f"stress.Probe{i % 50}",
+                "status": 2 if i % 4 else 1,
+                "goal": f"goal {i % 50}",
+            }
+            for i in range(100_000)
+        ]
+        wf = analyzer.build_from_report_entries(scan_id, entries)
+
+        probes = wf.nodes_by_type[WorkflowNodeType.PROBE]
+        assert [p.name for p in probes] == [f"stress.Probe{i}" for i in range(50)]
+        # i % 4 == 0 (failed) always lands on even-numbered probes
+        for i, probe in enumerate(probes):
+            failed = 1000 if i % 2 == 0 else 0
+            assert probe.metadata["failed"] == failed
+            assert probe.metadata["passed"] == 2000 - failed
+            assert probe.metadata["total"] == 2000
+            assert probe.description == f"goal {i}"
+
+    def test_graph_is_cached_after_build(self, analyzer, scan_id):
         """After build, get_workflow_graph should return the same object."""
-        wf = analyzer.build_from_report_entries(SCAN_ID, self.REPORT_ENTRIES)
-        assert analyzer.get_workflow_graph(SCAN_ID) is wf
+        wf = analyzer.build_from_report_entries(scan_id, REPORT_ENTRIES)
+        assert analyzer.get_workflow_graph(scan_id) is wf
 
-    def test_statistics_populated(self, analyzer):
-        wf = analyzer.build_from_report_entries(SCAN_ID, self.REPORT_ENTRIES)
+    def test_statistics_populated(self, prebuilt_report_graph):
+        wf = prebuilt_report_graph
         assert wf.statistics["probes_executed"] == 2
         assert wf.statistics["vulnerabilities_found"] == 1
 
-    def test_eval_with_total_evaluated_field(self, analyzer):
+    def test_eval_with_total_evaluated_field(self, analyzer, scan_id):
         """garak JSONL uses 'total_evaluated' instead of 'total' in eval entries."""
         entries = [
             {"entry_type": "attempt", "probe_classname": "ansiescape.AnsiEscaped", "status": 2},
@@ -589,14 +843,14 @@ class TestBuildFromReport:
                 "total_evaluated": 255,
             },
         ]
-        wf = analyzer.build_from_report_entries(SCAN_ID, entries)
+        wf = analyzer.build_from_report_entries(scan_id, entries)
         assert wf is not None
         # Should create detector node and edges from the eval entry
-        detectors = [n for n in wf.nodes if n.node_type == WorkflowNodeType.DETECTOR]
+        detectors = wf.nodes_by_type[WorkflowNodeType.DETECTOR]
         assert len(detectors) == 1
         assert detectors[0].name == "ansiescape.Escaped"
         # FAIL since passed(128) < total(255)
         det_edges = [e for e in wf.edges if e.edge_type == WorkflowEdgeType.DETECTION]
         assert len(det_edges) >= 1
-        vulns = [n for n in wf.nodes if n.node_type == WorkflowNodeType.VULNERABILITY]
+        vulns = wf.nodes_by_type[WorkflowNodeType.VULNERABILITY]
         assert len(vulns) == 1